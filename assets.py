@@ -1,19 +1,200 @@
+import os
+import threading
+from collections import OrderedDict
 import pygame
-from constants import IMAGES_DIR, SOUNDS_DIR
+from constants import IMAGES_DIR, SOUNDS_DIR, IMAGE_CACHE_BUDGET, TEXT_CACHE_BUDGET
 
-def load_image(filename, size=None):
-    path = f"{IMAGES_DIR}/{filename}"
-    image = pygame.image.load(path)
+
+class SurfaceCache:
+    # Process-wide LRU of decoded, scaled and display-converted surfaces.
+    # Keys are (path, size, alpha); the budget is counted in pixel bytes.
+    # Safe to query from the prefetch thread.
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, surface, converted):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[2]
+            size = surface_bytes(surface)
+            self._entries[key] = (surface, converted, size)
+            self.used_bytes += size
+            self._evict()
+
+    def discard(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[2]
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def _evict(self):
+        # Never evict the entry that was just inserted, even if it alone
+        # is bigger than the whole budget.
+        while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.used_bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return self._stats()
+
+    def _stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.used_bytes,
+            "budget": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+image_cache = SurfaceCache(IMAGE_CACHE_BUDGET)
+
+
+def _convert(image, alpha):
+    if pygame.display.get_surface() is None:
+        return image, False
+    return (image.convert_alpha() if alpha else image.convert()), True
+
+
+def image_key(filename, size=None, alpha=None):
+    if alpha is None:
+        alpha = filename.lower().endswith(".png")
+    path = os.path.join(IMAGES_DIR, filename)
+    return (os.path.normcase(path), tuple(size) if size else None, alpha)
+
+
+def is_image_cached(filename, size=None, alpha=None):
+    return image_key(filename, size, alpha) in image_cache
+
+
+def decode_image(filename, size=None):
+    # Disk read, decode and scale only: safe to run off the main thread.
+    image = pygame.image.load(os.path.join(IMAGES_DIR, filename))
     if size:
         image = pygame.transform.scale(image, size)
     return image
 
+
+def cache_decoded_image(filename, image, size=None, alpha=None):
+    # Hands a surface from decode_image() to the cache, converting it to
+    # the display format. Call from the main thread.
+    key = image_key(filename, size, alpha)
+    image, converted = _convert(image, key[2])
+    image_cache.put(key, image, converted)
+    return image
+
+
+def load_image(filename, size=None, alpha=None):
+    key = image_key(filename, size, alpha)
+    alpha = key[2]
+
+    entry = image_cache.get(key)
+    if entry is not None:
+        image, converted, _ = entry
+        if not converted:
+            # Loaded before the window existed; convert now that it does.
+            image, converted = _convert(image, alpha)
+            if converted:
+                image_cache.put(key, image, converted)
+        return image
+
+    return cache_decoded_image(filename, decode_image(filename, size), size, alpha)
+
+
+def set_image_cache_budget(budget_bytes):
+    image_cache.set_budget(budget_bytes)
+
+
+def image_cache_stats():
+    return image_cache.stats()
+
+
 def load_sound(filename):
     path = f"{SOUNDS_DIR}/{filename}"
     sound = pygame.mixer.Sound(path)
     return sound
 
+# One Font object per (kind, face, size), created on first use.
+_fonts = {}
+
+
 def load_font(filename='freesans', size=30):
+    key = ("sys", filename or None, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(filename or None, size)
+        _fonts[key] = font
+    return font
+
+
+def get_font(face=None, size=30):
+    # Like pygame.font.Font(face, size): None is pygame's default font.
+    key = ("file", face, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(face, size)
+        _fonts[key] = font
+    return font
+
+
+text_cache = SurfaceCache(TEXT_CACHE_BUDGET)
+
+
+def render_text_surface(text, font, color, antialias=True):
+    # Rendered text keyed by (string, font, color, antialias); unchanged
+    # text is rendered once and then only blitted.
+    key = (text, font, tuple(color), antialias)
+    entry = text_cache.get(key)
+    if entry is not None:
+        return entry[0]
+    surface = font.render(text, antialias, color)
+    text_cache.put(key, surface, True)
+    return surface
 
-    return pygame.font.SysFont(filename, size) if filename else pygame.font.SysFont(None, size)
 
+def text_cache_stats():
+    return text_cache.stats()
@@ -0,0 +1,98 @@
+import time
+import pygame
+from assets import load_sound
+from constants import SOUND_EFFECTS, EFFECT_CHANNELS
+
+
+class AudioBank:
+    # Sound effects decoded once (pygame.mixer.Sound keeps them as PCM in
+    # memory) and played on a fixed pool of reserved mixer channels, so
+    # music and other callers of Sound.play() never take them over.
+    #
+    # When every channel is busy, the new sound steals the voice with the
+    # lowest priority, oldest first, as long as that priority is not
+    # higher than its own; otherwise the new sound is dropped.
+    def __init__(self, effects=SOUND_EFFECTS, channel_count=EFFECT_CHANNELS):
+        self.sounds = {}
+        self.priorities = {}
+        self.decode_ms = {}
+        self.channels = []
+        self.voices = []
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+        if pygame.mixer.get_init() is None:
+            print("[DEBUG] Mixer not initialised, sound effects disabled")
+            return
+
+        if pygame.mixer.get_num_channels() < channel_count:
+            pygame.mixer.set_num_channels(channel_count)
+        pygame.mixer.set_reserved(channel_count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channel_count)]
+        self.voices = [None] * channel_count
+
+        for name, (filename, volume, priority) in effects.items():
+            start = time.perf_counter()
+            try:
+                sound = load_sound(filename)
+            except Exception as e:
+                print(f"[ERROR] Loading sound '{filename}': {e}")
+                continue
+            sound.set_volume(volume)
+            self.decode_ms[name] = (time.perf_counter() - start) * 1000
+            self.sounds[name] = sound
+            self.priorities[name] = priority
+
+    def _pick_channel(self, priority):
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+        victim = None
+        for i, (voice_priority, started) in enumerate(self.voices):
+            if voice_priority > priority:
+                continue
+            if victim is None or (voice_priority, started) < self.voices[victim]:
+                victim = i
+        if victim is not None:
+            self.stolen += 1
+        return victim
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        priority = self.priorities[name]
+        index = self._pick_channel(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+        channel = self.channels[index]
+        channel.play(sound)
+        self.voices[index] = (priority, time.perf_counter())
+        self.played += 1
+        return channel
+
+    def stats(self):
+        return {
+            "effects": len(self.sounds),
+            "channels": len(self.channels),
+            "decode_ms": dict(self.decode_ms),
+            "decode_ms_total": sum(self.decode_ms.values()),
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+        }
+
+
+_bank = None
+
+
+def get_audio_bank():
+    global _bank
+    if _bank is None:
+        _bank = AudioBank()
+    return _bank
+
+
+def play_effect(name):
+    return get_audio_bank().play(name)
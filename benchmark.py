@@ -0,0 +1,295 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+# Benchmarks always run without a window, on the same dummy drivers CI uses.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import numpy as np
+from constants import WIDTH, HEIGHT, BENCHMARK_BASELINE, BENCHMARK_THRESHOLD
+from display import get_display
+from engine import make_keys
+from level_pack import get_registry
+from levels import World, initialize_screen, level_offset, run_level, place_random_blobs_fair, prepare_world_data
+from player import Ninja, _animation_sets
+from profiler import get_profiler
+from assets import image_cache, load_image
+
+# Micro- and macro-benchmarks of the game's hot paths:
+#
+#     python benchmark.py                  run everything, compare with the baseline
+#     python benchmark.py world ninja      only benchmarks whose name contains a filter
+#     python benchmark.py world_build/level_3
+#     python benchmark.py --save           run and store the results as the new baseline
+#
+# Each benchmark reports milliseconds per operation; the best of several
+# repeats is compared against the baseline and anything more than its
+# threshold slower fails the run. Random blob placement is always seeded,
+# so every run measures the same worlds.
+
+SEED = 1234
+REPEAT = 5
+
+# Scripted play for Ninja.update: (left, right, jump, ticks), looped.
+INPUT_SCRIPT = [
+    (False, True, False, 40),
+    (False, True, True, 15),
+    (False, False, False, 10),
+    (True, False, False, 30),
+    (True, False, True, 15),
+    (False, True, False, 20),
+]
+NINJA_TICKS = 600
+
+MANY_BLOBS = 400
+HUGE_GRID = (200, 400)
+RUN_LEVEL_FRAMES = 120
+
+
+class BenchClock:
+    # Stands in for pygame.time.Clock: never waits, reports one tick per
+    # frame, and presses Escape after `frames` frames to leave run_level.
+    def __init__(self, frames, frame_ms):
+        self.frames = frames
+        self.frame_ms = frame_ms
+        self.count = 0
+
+    def tick(self, framerate=0):
+        self.count += 1
+        if self.count == self.frames:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+        return self.frame_ms
+
+    def get_time(self):
+        return self.frame_ms
+
+
+def time_calls(fn, repeat=REPEAT):
+    # Milliseconds per call for each repeat, like timeit (GC off while
+    # timing). Each repeat makes enough calls to run for at least 0.2 s,
+    # which keeps short benchmarks from drowning in timer noise.
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return [total * 1000 / number for total in timer.repeat(repeat, number)]
+
+
+def seeded_world_data(level, seed=SEED):
+    return prepare_world_data(level, seed)
+
+
+def make_world(level, headless=False):
+    background = None if headless else load_image(level.background, (WIDTH, HEIGHT))
+    return World(seeded_world_data(level), *level_offset(), background, headless=headless)
+
+
+def floor_grid(rows, cols):
+    # A big open grid: a floor of dirt every fourth row, spawn top left and
+    # the door bottom right, so blobs fit on every floor.
+    grid = [[0] * cols for _ in range(rows)]
+    for r in range(3, rows, 4):
+        grid[r] = [1] * cols
+    grid[2][1] = 9
+    grid[rows - 2][cols - 2] = 7
+    return grid
+
+
+def script_keys():
+    keys = []
+    for left, right, jump, ticks in INPUT_SCRIPT:
+        keys += [make_keys(left, right, jump)] * ticks
+    return keys
+
+
+def bench_world_build():
+    registry = get_registry()
+    results = {}
+    for level_id in registry.ids():
+        level = registry.get(level_id)
+        make_world(level)  # warm the image cache; we measure building, not decoding
+        results[f"world_build/level_{level_id}"] = time_calls(lambda: make_world(level))
+    return results
+
+
+def bench_ninja_update():
+    world = make_world(get_registry().get(1))
+    player = Ninja(*world.spawn_pos)
+    keys = script_keys()
+    world.activate(world.spawn_pos)
+
+    def play():
+        player.reset(*world.spawn_pos)
+        for i in range(NINJA_TICKS):
+            if player.update(keys[i % len(keys)], world.tile_grid, world.blobs):
+                player.reset(*world.spawn_pos)
+
+    samples = time_calls(play)
+    return {"ninja_update/600_ticks": samples}
+
+
+def bench_blob_update():
+    grid = floor_grid(50, 90)
+    world = World(place_random_blobs_fair(MANY_BLOBS, grid, SEED), *level_offset(), headless=True)
+    world.activate(world.bounds.center)
+
+    return {f"blob_update/{len(world.blobs)}_blobs": time_calls(world.blobs.update)}
+
+
+def bench_place_blobs():
+    small = get_registry().get(1).grid
+    huge = floor_grid(*HUGE_GRID)
+    return {
+        "place_blobs/level_1": time_calls(lambda: place_random_blobs_fair(5, small, SEED)),
+        "place_blobs/%dx%d" % HUGE_GRID: time_calls(lambda: place_random_blobs_fair(1000, huge, SEED)),
+    }
+
+
+def bench_skin_load():
+    spawn = (100, 100)
+
+    def cold():
+        # Nothing cached: the atlas is read from disk and sliced again.
+        _animation_sets.clear()
+        image_cache.clear()
+        Ninja(*spawn, skin="ninja")
+
+    def warm():
+        Ninja(*spawn, skin="ninjagirlnew")
+
+    return {
+        "skin_load/cold": time_calls(cold),
+        "skin_load/warm": time_calls(warm),
+    }
+
+
+def bench_run_level():
+    # Whole frames of the real level loop (simulation, drawing, flip),
+    # taken from the frame profiler so level setup is not counted.
+    profiler = get_profiler()
+    samples = []
+    for _ in range(REPEAT):
+        profiler.frames.clear()
+        clock = BenchClock(RUN_LEVEL_FRAMES, 1000 / 60)
+        run_level(get_display().surface, clock, 1, {}, render_fps=0)
+        samples.append(profiler.averages("level 1")["frame"])
+    return {"run_level/frame": samples}
+
+
+BENCHMARKS = [
+    bench_world_build,
+    bench_ninja_update,
+    bench_blob_update,
+    bench_place_blobs,
+    bench_skin_load,
+    bench_run_level,
+]
+
+
+def run_benchmarks(filters=()):
+    pygame.init()
+    initialize_screen()
+    results = {}
+    for bench in BENCHMARKS:
+        group = bench.__name__[len("bench_"):]
+        if filters and not any(f.startswith(group) or f in group for f in filters):
+            continue
+        # The game's debug prints would swamp the report and cost time.
+        with contextlib.redirect_stdout(io.StringIO()):
+            samples = bench()
+        for name, values in samples.items():
+            if filters and not any(f in name for f in filters):
+                continue
+            results[name] = {"best_ms": min(values), "median_ms": statistics.median(values)}
+    pygame.quit()
+    return results
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, threshold):
+    # Results are merged into an existing baseline, so saving a filtered
+    # run only replaces the benchmarks that ran.
+    old = load_baseline(path) or {}
+    entries = dict(old.get("benchmarks", {}))
+    for name, r in results.items():
+        entry = {"best_ms": round(r["best_ms"], 5), "median_ms": round(r["median_ms"], 5)}
+        if "threshold" in entries.get(name, {}):
+            entry["threshold"] = entries[name]["threshold"]
+        entries[name] = entry
+    baseline = {
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "threshold": threshold,
+        "benchmarks": dict(sorted(entries.items())),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+    print(f"Saved {len(results)} benchmarks to {path}")
+
+
+def compare(results, baseline, threshold=None):
+    # Returns the names of benchmarks that regressed. A benchmark entry in
+    # the baseline may carry its own "threshold" for noisy measurements;
+    # `threshold` overrides the baseline's default.
+    regressions = []
+    default_threshold = threshold if threshold is not None else baseline.get("threshold", BENCHMARK_THRESHOLD)
+    print(f"{'benchmark':<28}{'best ms':>10}{'baseline':>10}{'change':>9}")
+    for name, result in sorted(results.items()):
+        entry = baseline["benchmarks"].get(name)
+        if entry is None:
+            print(f"{name:<28}{result['best_ms']:10.3f}{'-':>10}{'new':>9}")
+            continue
+        change = result["best_ms"] / entry["best_ms"] - 1
+        threshold = entry.get("threshold", default_threshold)
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28}{result['best_ms']:10.3f}{entry['best_ms']:10.3f}{change:+9.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game's benchmarks.")
+    parser.add_argument("filters", nargs="*", help="only run benchmarks whose name contains one of these")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="allowed slowdown before a result is a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filters)
+    if args.save:
+        save_baseline(args.baseline, results, args.threshold or BENCHMARK_THRESHOLD)
+        return 0
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save to create one.")
+        baseline = {"benchmarks": {}}
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import sys
+import numpy as np
+
+
+class TriggerGrid:
+    # Uniform grid over static trigger rects (coins, the door). Each cell
+    # holds a dict of the entries touching it, so a query only looks at the
+    # cells around the rect it is given and removing an entry is O(1).
+    # `queries` and `candidates` count the work done by query() until
+    # reset_counts().
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+        self._next_id = 0
+        self.queries = 0
+        self.candidates = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def nbytes(self):
+        # Containers, entry tuples and rects; payloads (shared images) excluded.
+        size = sys.getsizeof(self.cells) + sys.getsizeof(self.entries)
+        for bucket in self.cells.values():
+            size += sys.getsizeof(bucket) + sum(sys.getsizeof(entry) for entry in bucket.values())
+        for entry in self.entries.values():
+            size += sys.getsizeof(entry) + sys.getsizeof(entry[0]) + sys.getsizeof(entry[3])
+        return size
+
+    def _cells(self, rect):
+        size = self.cell_size
+        return [(col, row)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for col in range(rect.left // size, (rect.right - 1) // size + 1)]
+
+    def add(self, rect, kind, payload=None):
+        entry_id = self._next_id
+        self._next_id += 1
+        cells = self._cells(rect)
+        self.entries[entry_id] = (rect, kind, payload, cells)
+        for cell in cells:
+            self.cells.setdefault(cell, {})[entry_id] = (rect, kind, payload)
+        return entry_id
+
+    def remove(self, entry_id):
+        _, _, _, cells = self.entries.pop(entry_id)
+        for cell in cells:
+            bucket = self.cells[cell]
+            del bucket[entry_id]
+            if not bucket:
+                del self.cells[cell]
+
+    def _collect(self, rect, kind):
+        found = {}
+        cells = self.cells
+        for cell in self._cells(rect):
+            bucket = cells.get(cell)
+            if bucket:
+                for entry_id, entry in bucket.items():
+                    if entry[1] == kind:
+                        found[entry_id] = entry
+        return found
+
+    def query(self, rect, kind):
+        # [(id, rect, payload)] of the `kind` entries overlapping `rect`.
+        self.queries += 1
+        found = self._collect(rect, kind)
+        self.candidates += len(found)
+        return [(entry_id, entry[0], entry[2]) for entry_id, entry in found.items()
+                if rect.colliderect(entry[0])]
+
+    def visible(self, rect, kind):
+        # Like query(), for drawing: not counted.
+        return [entry for entry in self._collect(rect, kind).values() if rect.colliderect(entry[0])]
+
+    def reset_counts(self):
+        self.queries = 0
+        self.candidates = 0
+
+
+class SweepAndPrune:
+    # Moving boxes kept sorted by their left edge. The boxes barely move
+    # between ticks, so re-sorting from the previous order is close to
+    # linear; candidates() then cuts out the boxes whose left edge lies in
+    # a range with two binary searches.
+    def __init__(self):
+        self.order = np.empty(0, dtype=np.intp)
+        self.sorted_left = np.empty(0, dtype=np.int64)
+        self.queries = 0
+        self.candidates = 0
+
+    def update(self, left):
+        if len(self.order) != len(left):
+            self.order = np.argsort(left, kind="stable")
+        else:
+            self.order = self.order[np.argsort(left[self.order], kind="stable")]
+        self.sorted_left = left[self.order]
+
+    def query(self, low, high):
+        # Positions (into the array given to update()) of boxes with
+        # low <= left < high.
+        self.queries += 1
+        start, end = np.searchsorted(self.sorted_left, (low, high))
+        self.candidates += int(end - start)
+        return self.order[start:end]
+
+    def reset_counts(self):
+        self.queries = 0
+        self.candidates = 0
@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+import pygame
+from constants import (IMAGES_DIR, SPRITE_SIZE, NINJA_ANIMATIONS, FRAMES_PER_ANIMATION,
+                       SKINS, ATLAS_IMAGE, ATLAS_META)
+
+# Packs every skin's animation frames into one pre-scaled sprite sheet:
+# one row per animation, one column per frame. Run from the project root
+# whenever the source PNGs in assets/images/<skin>/png change:
+#
+#     python build_atlas.py [skin ...]
+
+
+def build_skin_atlas(skin):
+    frame_w, frame_h = SPRITE_SIZE
+    source_dir = os.path.join(IMAGES_DIR, skin, 'png')
+    names = list(NINJA_ANIMATIONS)
+    atlas = pygame.Surface((frame_w * FRAMES_PER_ANIMATION, frame_h * len(names)), pygame.SRCALPHA)
+    meta = {"frame_size": [frame_w, frame_h], "animations": {}}
+
+    for row, name in enumerate(names):
+        prefix = NINJA_ANIMATIONS[name]
+        frames = []
+        for num in range(FRAMES_PER_ANIMATION):
+            path = os.path.join(source_dir, f"{prefix}{str(num).zfill(3)}.png")
+            try:
+                img = pygame.image.load(path)
+            except Exception as e:
+                print(f"[ERROR] Loading image '{path}': {e}")
+                continue
+            img = pygame.transform.scale(img, SPRITE_SIZE)
+            x, y = len(frames) * frame_w, row * frame_h
+            atlas.blit(img, (x, y))
+            frames.append([x, y, frame_w, frame_h])
+        meta["animations"][name] = frames
+
+    image_path = os.path.join(IMAGES_DIR, skin, ATLAS_IMAGE)
+    meta_path = os.path.join(IMAGES_DIR, skin, ATLAS_META)
+    pygame.image.save(atlas, image_path)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    print(f"{skin}: {sum(len(v) for v in meta['animations'].values())} frames -> "
+          f"{image_path} ({os.path.getsize(image_path)} bytes)")
+
+
+def main(skins):
+    pygame.init()
+    for skin in skins:
+        build_skin_atlas(skin)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or SKINS)
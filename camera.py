@@ -0,0 +1,28 @@
+import pygame
+
+
+class Camera:
+    # Top-left of the view in world pixels, following a point and clamped
+    # so the view never leaves the level. The bounds always include the
+    # screen at (0, 0), so a level that fits on screen keeps its fixed,
+    # centred layout and the camera never moves.
+    def __init__(self, view_size, world_rect):
+        self.width, self.height = view_size
+        self.bounds = pygame.Rect(world_rect).union(pygame.Rect(0, 0, self.width, self.height))
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self):
+        return self.x, self.y
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def follow(self, center):
+        x = min(max(round(center[0]) - self.width // 2, self.bounds.left), self.bounds.right - self.width)
+        y = min(max(round(center[1]) - self.height // 2, self.bounds.top), self.bounds.bottom - self.height)
+        moved = (x, y) != (self.x, self.y)
+        self.x, self.y = x, y
+        return moved
@@ -0,0 +1,61 @@
+import pygame
+
+
+class TileGrid:
+    # Looks tiles up by grid cell straight from the level data. A query
+    # only visits the cells a rect covers and builds rects just for the
+    # tiles it returns, so neither its cost nor the index's memory grows
+    # with level size. Edits to the data are seen immediately.
+    def __init__(self, origin_x, origin_y, cell_size, data):
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cell_size = cell_size
+        self.data = data
+        self.rows = len(data)
+        self.cols = max((len(row) for row in data), default=0)
+
+    def tile_rect(self, row, col):
+        size = self.cell_size
+        return pygame.Rect(self.origin_x + col * size, self.origin_y + row * size, size, size)
+
+    def _cell_span(self, rect):
+        # Plain comparisons instead of min()/max(): this runs several times
+        # per entity per tick.
+        size = self.cell_size
+        first_col = (rect.left - self.origin_x) // size
+        last_col = (rect.right - 1 - self.origin_x) // size
+        first_row = (rect.top - self.origin_y) // size
+        last_row = (rect.bottom - 1 - self.origin_y) // size
+        if first_col < 0:
+            first_col = 0
+        if last_col >= self.cols:
+            last_col = self.cols - 1
+        if first_row < 0:
+            first_row = 0
+        if last_row >= self.rows:
+            last_row = self.rows - 1
+        return first_row, last_row, first_col, last_col
+
+    def query(self, rect, kinds):
+        # Overlapping tile rects of the given kinds, in row-major order.
+        first_row, last_row, first_col, last_col = self._cell_span(rect)
+        size = self.cell_size
+        hits = []
+        for row in range(first_row, last_row + 1):
+            cells = self.data[row]
+            y = self.origin_y + row * size
+            for col in range(first_col, last_col + 1):
+                if cells[col] in kinds:
+                    tile = pygame.Rect(self.origin_x + col * size, y, size, size)
+                    if rect.colliderect(tile):
+                        hits.append(tile)
+        return hits
+
+    def collides(self, rect, kinds):
+        first_row, last_row, first_col, last_col = self._cell_span(rect)
+        for row in range(first_row, last_row + 1):
+            cells = self.data[row]
+            for col in range(first_col, last_col + 1):
+                if cells[col] in kinds and rect.colliderect(self.tile_rect(row, col)):
+                    return True
+        return False
@@ -14,3 +14,112 @@ GIFS_DIR = f"{ASSETS_DIR}/gifs"
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
+
+# Decoded image cache budget (bytes of pixel data)
+IMAGE_CACHE_BUDGET = 96 * 1024 * 1024
+
+# Ninja sprites: frame size on screen and the animations packed into each skin's atlas
+SPRITE_SIZE = (40, 50)
+NINJA_ANIMATIONS = {
+    "run": "Run__",
+    "idle": "Idle__",
+    "jump": "Jump__",
+    "attack": "Attack__",
+}
+FRAMES_PER_ANIMATION = 10
+SKINS = ("ninja", "ninjagirlnew")
+ATLAS_IMAGE = "atlas.png"
+ATLAS_META = "atlas.json"
+
+# Timing: gameplay always advances in fixed SIM_HZ ticks; levels render
+# at RENDER_FPS (0 = uncapped) and interpolate between ticks
+SIM_HZ = 60
+SIM_TICK_MS = 1000 / SIM_HZ
+RENDER_FPS = 60
+MAX_FRAME_MS = 250
+ANIMATION_FRAME_MS = 100
+
+# Dirty-rectangle rendering for levels: off by default; when on, a frame
+# falls back to a full flip once its dirty area passes this share of the screen
+DIRTY_RECT_RENDERING = False
+DIRTY_RECT_FULL_REDRAW_RATIO = 0.5
+
+# Tile codes that block movement: blobs bounce off dirt and grass, the
+# player also stands on lava (and dies from it)
+SOLID_TILES = (1, 2)
+PLAYER_BLOCKING_TILES = (1, 2, 4)
+LAVA_TILES = (4,)
+
+# Level data: editable JSON source and the packed file the game reads
+LEVELS_DIR = f"{ASSETS_DIR}/levels"
+LEVEL_SOURCE = f"{LEVELS_DIR}/levels.json"
+LEVEL_PACK = f"{LEVELS_DIR}/levels.pack"
+
+# Sound effects decoded at startup: name -> (file in SOUNDS_DIR, volume, priority).
+# Higher priority effects may steal a channel from lower ones.
+SOUND_EFFECTS = {
+    "coin": ("coin.mp3", 0.5, 1),
+}
+EFFECT_CHANNELS = 4
+
+# Rendered text cache budget (bytes of pixel data)
+TEXT_CACHE_BUDGET = 4 * 1024 * 1024
+
+# Frame profiler: frames kept in the ring buffer, overlay refresh rate, and
+# where main() writes the buffer as CSV on exit (None = don't)
+PROFILER_HISTORY = 600
+PROFILER_OVERLAY_REFRESH_MS = 250
+PROFILE_CSV = None
+
+# Benchmarks (benchmark.py): stored baseline, and how much slower than the
+# baseline a result may get before it counts as a regression
+BENCHMARK_BASELINE = "benchmarks/baseline.json"
+BENCHMARK_THRESHOLD = 0.25
+
+# Startup: background music (optional, skipped if missing) and the
+# time-to-first-frame main() aims for, measured from process start
+THEME_MUSIC = f"{SOUNDS_DIR}/theme_sound.mp3"
+MUSIC_VOLUME = 0.1
+STARTUP_FRAME_BUDGET_MS = 300
+SPLASH_COLOR = (1, 50, 32)
+
+# Level streaming: levels are split into CHUNK_TILES x CHUNK_TILES chunks.
+# Chunks on screen are pre-rendered and cached within CHUNK_CACHE_BUDGET;
+# coins and blobs are only simulated within a view's size of the player
+# plus ACTIVE_MARGIN_CHUNKS
+CHUNK_TILES = 8
+CHUNK_CACHE_BUDGET = 32 * 1024 * 1024
+ACTIVE_MARGIN_CHUNKS = 1
+
+# Display: the game draws into a WIDTH x HEIGHT logical surface that is
+# scaled to fit the window once per frame. DISPLAY_WINDOW_SIZE None opens
+# a window of the logical size. When scaling, DISPLAY_QUALITY_LEVELS are
+# (internal scale, smooth filter) from best to cheapest; with
+# DISPLAY_ADAPTIVE, DISPLAY_ADAPT_FRAMES frames over the budget step down
+# a level and DISPLAY_RECOVER_FRAMES frames under DISPLAY_RECOVER_RATIO of
+# it step back up
+DISPLAY_WINDOW_SIZE = None
+DISPLAY_RESIZABLE = False
+DISPLAY_ADAPTIVE = False
+DISPLAY_QUALITY_LEVELS = ((1.0, True), (0.5, True), (1.0, False))
+DISPLAY_FRAME_BUDGET_MS = SIM_TICK_MS
+DISPLAY_ADAPT_FRAMES = 30
+DISPLAY_RECOVER_RATIO = 0.6
+DISPLAY_RECOVER_FRAMES = 120
+
+# Menus: with MENU_IDLE_RENDERING a menu sleeps until input arrives and
+# only redraws after it, waking at least every MENU_IDLE_TIMEOUT_MS;
+# redraws are capped at MENU_FPS
+MENU_IDLE_RENDERING = True
+MENU_FPS = 60
+MENU_IDLE_TIMEOUT_MS = 1000
+
+# Save game: progress is written to SAVE_FILE by a background thread,
+# SAVE_COALESCE_MS after the first of a burst of changes
+SAVE_FILE = "savegame.dat"
+SAVE_COALESCE_MS = 500
+
+# Replays: with REPLAY_RECORDING every level run's input is saved to
+# REPLAY_DIR when it ends; play one back with `python replay.py FILE`
+REPLAY_RECORDING = False
+REPLAY_DIR = "replays"
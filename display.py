@@ -0,0 +1,146 @@
+import pygame
+from constants import (WIDTH, HEIGHT, DISPLAY_WINDOW_SIZE, DISPLAY_RESIZABLE, DISPLAY_ADAPTIVE,
+                       DISPLAY_QUALITY_LEVELS, DISPLAY_FRAME_BUDGET_MS, DISPLAY_ADAPT_FRAMES,
+                       DISPLAY_RECOVER_RATIO, DISPLAY_RECOVER_FRAMES)
+
+
+class Display:
+    # Everything is drawn into `surface`, a fixed WIDTH x HEIGHT logical
+    # surface, and present() puts it in the window once per frame, scaled
+    # to fit and letterboxed. A window of exactly the logical size that
+    # cannot be resized is drawn into directly, so presenting costs
+    # nothing extra.
+    #
+    # When the frame has to be scaled, DISPLAY_QUALITY_LEVELS lists
+    # (internal scale, smooth filter) pairs from best to cheapest. In
+    # adaptive mode, frames over budget step down the list and frames well
+    # under it step back up.
+    def __init__(self, logical_size=(WIDTH, HEIGHT)):
+        self.logical_size = tuple(logical_size)
+        self.window = None
+        self.surface = None
+        # Until open(), a window set up elsewhere is presented as is.
+        self.direct = True
+        self.dest = None
+        self.target = None
+        self.internal = None
+        self.adaptive = DISPLAY_ADAPTIVE
+        self.quality = 0
+        self.frame_ms = None
+        self._over = 0
+        self._under = 0
+
+    def open(self, window_size=None, resizable=DISPLAY_RESIZABLE):
+        size = tuple(window_size or DISPLAY_WINDOW_SIZE or self.logical_size)
+        self.window = pygame.display.set_mode(size, pygame.RESIZABLE if resizable else 0)
+        self.direct = size == self.logical_size and not resizable
+        if self.direct:
+            self.surface = self.window
+        else:
+            self.surface = pygame.Surface(self.logical_size).convert()
+        self._fit()
+        return self.surface
+
+    def _fit(self):
+        # Largest rect of the logical aspect ratio centred in the window.
+        self.window = pygame.display.get_surface()
+        window_w, window_h = self.window.get_size()
+        logical_w, logical_h = self.logical_size
+        scale = min(window_w / logical_w, window_h / logical_h)
+        self.dest = pygame.Rect(0, 0, max(1, round(logical_w * scale)), max(1, round(logical_h * scale)))
+        self.dest.center = (window_w // 2, window_h // 2)
+        self.target = self.window.subsurface(self.dest)
+        self.window_size = (window_w, window_h)
+        self.internal = None
+        self.window.fill((0, 0, 0))
+
+    @property
+    def scaled(self):
+        return not self.direct and self.dest.size != self.logical_size
+
+    def present(self, rects=None):
+        # Shows the logical surface; `rects` (logical coordinates) limits
+        # the update to those areas when the frame isn't scaled.
+        if self.direct:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        window = pygame.display.get_surface()
+        if window is not self.window or window.get_size() != self.window_size:
+            self._fit()
+            rects = None
+        if not self.scaled:
+            if rects is None:
+                self.window.blit(self.surface, self.dest)
+                pygame.display.flip()
+            else:
+                moved = [pygame.Rect(rect).move(self.dest.topleft) for rect in rects]
+                for rect, area in zip(moved, rects):
+                    self.window.blit(self.surface, rect, area)
+                pygame.display.update(moved)
+            return
+        scale, smooth = DISPLAY_QUALITY_LEVELS[self.quality]
+        source = self.surface
+        if scale < 1:
+            size = (round(self.logical_size[0] * scale), round(self.logical_size[1] * scale))
+            if self.internal is None or self.internal.get_size() != size:
+                self.internal = pygame.Surface(size, 0, self.surface)
+            source = pygame.transform.scale(self.surface, size, self.internal)
+        if smooth:
+            pygame.transform.smoothscale(source, self.dest.size, self.target)
+        else:
+            pygame.transform.scale(source, self.dest.size, self.target)
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        # Window coordinates (mouse events) to logical coordinates.
+        if self.direct:
+            return pos
+        return ((pos[0] - self.dest.x) * self.logical_size[0] // self.dest.width,
+                (pos[1] - self.dest.y) * self.logical_size[1] // self.dest.height)
+
+    def mouse_pos(self):
+        return self.to_logical(pygame.mouse.get_pos())
+
+    def adapt(self, frame_ms):
+        # Feeds one frame's busy time (everything but the wait for the next
+        # frame) to adaptive mode. Only scaling can be made cheaper, so an
+        # unscaled frame is left alone.
+        if not self.adaptive or not self.scaled:
+            return
+        if self.frame_ms is None:
+            self.frame_ms = frame_ms
+        else:
+            self.frame_ms += (frame_ms - self.frame_ms) * 0.1
+        if self.frame_ms > DISPLAY_FRAME_BUDGET_MS:
+            self._over += 1
+            self._under = 0
+        elif self.frame_ms < DISPLAY_FRAME_BUDGET_MS * DISPLAY_RECOVER_RATIO:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+        if self._over >= DISPLAY_ADAPT_FRAMES and self.quality < len(DISPLAY_QUALITY_LEVELS) - 1:
+            self.set_quality(self.quality + 1)
+        elif self._under >= DISPLAY_RECOVER_FRAMES and self.quality > 0:
+            self.set_quality(self.quality - 1)
+
+    def set_quality(self, quality):
+        self.quality = quality
+        self.frame_ms = None
+        self._over = self._under = 0
+        scale, smooth = DISPLAY_QUALITY_LEVELS[quality]
+        print(f"[DEBUG] Display quality {quality}: internal scale {scale}, "
+              f"{'smooth' if smooth else 'fast'} scaling")
+
+
+_display = None
+
+
+def get_display():
+    global _display
+    if _display is None:
+        _display = Display()
+    return _display
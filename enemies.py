@@ -0,0 +1,162 @@
+import numpy as np
+from broadphase import SweepAndPrune
+
+# A blob's hitbox against the player is its rect shrunk by this much on
+# every side (the old blob_rect.inflate(-10, -10)).
+HIT_INSET = 5
+
+
+class BlobManager:
+    # All blobs of a level as parallel NumPy arrays (structure of arrays)
+    # instead of one object each. A tick moves and bounces every active
+    # blob in a few array operations against a boolean map of solid
+    # cells, the player is tested against all of them at once, and they
+    # are drawn from one shared image.
+    #
+    # A blob patrols horizontally between start_x and start_x + move_range,
+    # turning around at either end or when its next step would overlap a
+    # solid tile. Blobs are narrower than a tile, so a step only ever
+    # touches the two columns under its left and right edges.
+    def __init__(self, data, origin, cell_size, size, move_range, solid_kinds, image=None):
+        self.origin_x, self.origin_y = origin
+        self.cell_size = cell_size
+        self.width, self.height = size
+        self.inset = (cell_size - self.width) // 2
+        self.move_range = move_range
+        self.image = image
+        rows = len(data)
+        cols = max((len(row) for row in data), default=0)
+        # Spare columns on each side, as far as a blob at the map's edge can
+        # reach, stand for everything off the map, which never blocks.
+        self.pad = move_range // cell_size + 2
+        self.solid = np.zeros((rows, cols + 2 * self.pad), dtype=bool)
+        # Tile kind -> solid, indexed with the whole grid at once.
+        solid_lut = np.zeros(256, dtype=bool)
+        solid_lut[list(solid_kinds)] = True
+        if all(len(row) == cols for row in data):
+            cells = np.frombuffer(b"".join(bytes(row) for row in data), dtype=np.uint8)
+            self.solid[:, self.pad:self.pad + cols] = solid_lut[cells.reshape(rows, cols)]
+        else:
+            for r, row in enumerate(data):
+                self.solid[r, self.pad:self.pad + len(row)] = solid_lut[np.frombuffer(bytes(row), dtype=np.uint8)]
+        self.x = np.empty(0, dtype=np.int64)
+        self.y = np.empty(0, dtype=np.int64)
+        self.prev_x = np.empty(0, dtype=np.int64)
+        self.start_x = np.empty(0, dtype=np.int64)
+        self.end_x = np.empty(0, dtype=np.int64)
+        self.direction = np.empty(0, dtype=np.int64)
+        # Offsets of each blob's top and bottom row in the flattened solid
+        # map (the same row unless a blob straddles two), and its hitbox rows.
+        self.top_base = np.empty(0, dtype=np.intp)
+        self.bottom_base = np.empty(0, dtype=np.intp)
+        self.hit_top = np.empty(0, dtype=np.int64)
+        self.hit_bottom = np.empty(0, dtype=np.int64)
+        self.straddles = False
+        # Index array of the blobs being simulated, or slice(None) when that
+        # is all of them, so the common case needs no gather and scatter.
+        self.active = slice(None)
+        self.active_count = 0
+        # Active blobs sorted by x for touches(); re-sorted after they move.
+        self.sweep = SweepAndPrune()
+        self._swept = False
+
+    def __len__(self):
+        return len(self.x)
+
+    def nbytes(self):
+        arrays = (self.solid, self.x, self.y, self.prev_x, self.start_x, self.end_x, self.direction,
+                  self.top_base, self.bottom_base, self.hit_top, self.hit_bottom)
+        return sum(array.nbytes for array in arrays)
+
+    def add(self, positions):
+        # Spawns a blob in each tile whose top-left is given; returns their indices.
+        first = len(self.x)
+        tiles = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        x = tiles[:, 0] + self.inset
+        y = tiles[:, 1] + self.inset
+        self.x = np.concatenate((self.x, x))
+        self.y = np.concatenate((self.y, y))
+        self.prev_x = np.concatenate((self.prev_x, x))
+        self.start_x = np.concatenate((self.start_x, tiles[:, 0]))
+        self.end_x = np.concatenate((self.end_x, tiles[:, 0] + self.move_range))
+        self.direction = np.concatenate((self.direction, np.ones(len(tiles), dtype=np.int64)))
+        stride = self.solid.shape[1]
+        top_base = (y - self.origin_y) // self.cell_size * stride
+        bottom_base = (y + self.height - 1 - self.origin_y) // self.cell_size * stride
+        self.top_base = np.concatenate((self.top_base, top_base))
+        self.bottom_base = np.concatenate((self.bottom_base, bottom_base))
+        self.straddles = self.straddles or bool(np.any(top_base != bottom_base))
+        self.hit_top = np.concatenate((self.hit_top, y + HIT_INSET))
+        self.hit_bottom = np.concatenate((self.hit_bottom, y + self.height - HIT_INSET))
+        return np.arange(first, len(self.x))
+
+    def set_active(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        self.active_count = len(indices)
+        if np.array_equal(indices, np.arange(len(self.x))):
+            self.active = slice(None)
+        else:
+            self.active = indices
+        self._swept = False
+
+    def set_solid(self, row, col, solid):
+        self.solid[row, col + self.pad] = solid
+
+    def positions(self):
+        idx = self.active
+        return list(zip(self.x[idx].tolist(), self.y[idx].tolist()))
+
+    def update(self):
+        if not self.active_count:
+            return
+        idx = self.active
+        x = self.x[idx]
+        direction = self.direction[idx]
+        self.prev_x[idx] = x
+        next_x = x + direction
+        shift = self.pad * self.cell_size - self.origin_x
+        left_col = (next_x + shift) // self.cell_size
+        right_col = (next_x + (shift + self.width - 1)) // self.cell_size
+        solid = self.solid.ravel()
+        top = self.top_base[idx]
+        blocked = solid[top + left_col] | solid[top + right_col]
+        if self.straddles:
+            bottom = self.bottom_base[idx]
+            blocked |= solid[bottom + left_col] | solid[bottom + right_col]
+        x = np.where(blocked, x, next_x)
+        # Blocked and out-of-range blobs both turn; one doing both turns twice.
+        turn = blocked ^ ((x > self.end_x[idx]) | (x < self.start_x[idx]))
+        self.x[idx] = x
+        self.direction[idx] = np.where(turn, -direction, direction)
+        self._swept = False
+
+    def touches(self, rect):
+        # True if `rect` overlaps any active blob's hitbox. Sweep and prune
+        # narrows the blobs down to those overlapping it horizontally.
+        if not self.active_count:
+            return False
+        idx = self.active
+        if not self._swept:
+            self.sweep.update(self.x[idx])
+            self._swept = True
+        near = self.sweep.query(rect.left - self.width + HIT_INSET + 1, rect.right - HIT_INSET)
+        if not len(near):
+            return False
+        if not isinstance(idx, slice):
+            near = idx[near]
+        return bool(((self.hit_top[near] < rect.bottom) & (self.hit_bottom[near] > rect.top)).any())
+
+    def draw(self, screen, alpha=1.0, view=(0, 0), view_size=None):
+        if not self.active_count or self.image is None:
+            return
+        idx = self.active
+        prev = self.prev_x[idx]
+        # np.round rounds halves to even, like the round() in interpolate().
+        x = np.round(prev + (self.x[idx] - prev) * alpha).astype(np.int64) - view[0]
+        y = self.y[idx] - view[1]
+        if view_size is not None:
+            shown = (x < view_size[0]) & (x + self.width > 0) & (y < view_size[1]) & (y + self.height > 0)
+            x = x[shown]
+            y = y[shown]
+        image = self.image
+        screen.blits([(image, pos) for pos in zip(x.tolist(), y.tolist())], doreturn=False)
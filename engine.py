@@ -0,0 +1,51 @@
+import os
+import collections
+
+# Headless runs never open a window; make sure SDL does not try to either.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from levels import World, step_level, level_offset
+from player import Ninja
+
+
+def make_keys(left=False, right=False, jump=False):
+    # Stand-in for pygame.key.get_pressed() when driving the game from a script.
+    keys = collections.defaultdict(bool)
+    keys[pygame.K_LEFT] = left
+    keys[pygame.K_RIGHT] = right
+    keys[pygame.K_SPACE] = jump
+    return keys
+
+
+class HeadlessEngine:
+    # Runs a level's simulation without a display or any image decoding.
+    # Each step() is one fixed tick and returns the tick's StepResult;
+    # `outcome` is set to "door", "lava" or "blob" once the run ends.
+    def __init__(self, world_data, skin="ninja"):
+        offset_x, offset_y = level_offset()
+        self.world = World(world_data, offset_x, offset_y, headless=True)
+        self.player = Ninja(*self.world.spawn_pos, skin=skin, headless=True)
+        self.ticks = 0
+        self.coins = 0
+        self.outcome = None
+
+    def step(self, keys):
+        if self.outcome is not None:
+            raise RuntimeError(f"Simulation already ended ({self.outcome}).")
+        result = step_level(self.world, self.player, keys)
+        self.ticks += 1
+        self.coins += result.coins
+        if result.died:
+            self.outcome = result.died
+        elif result.reached_door:
+            self.outcome = "door"
+        return result
+
+    def run(self, inputs, max_ticks=None):
+        # `inputs` is any iterable of key mappings, one per tick.
+        for keys in inputs:
+            if self.outcome is not None or (max_ticks is not None and self.ticks >= max_ticks):
+                break
+            self.step(keys)
+        return self.outcome
@@ -1,4 +1,6 @@
 all_coins_collected = 0
 coins_collected = 0
 selected_skin = "ninja"
-alternative_skin_bought = False
\ No newline at end of file
+alternative_skin_bought = False
+# Level id -> "unlocked"; levels not in it are locked.
+level_status = {}
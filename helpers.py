@@ -1,4 +1,5 @@
 import pygame
+from assets import render_text_surface
 
 def scale_button(button, scaling_factor, screen_width):
     btn_width, btn_height = button.get_size()
@@ -7,7 +8,7 @@ def scale_button(button, scaling_factor, screen_width):
     return pygame.transform.scale(button, (btn_new_width, btn_new_height))
 
 def render_text(screen, text, font, color, center):
-    text_surface = font.render(text, True, color)
+    text_surface = render_text_surface(text, font, color)
     text_rect = text_surface.get_rect(center=center)
     screen.blit(text_surface, text_rect)
 
@@ -0,0 +1,119 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from constants import LEVEL_SOURCE, LEVEL_PACK
+
+# Binary level pack, little-endian:
+#
+#   header   "NJLP", u16 version, u16 level count
+#   index    per level: u16 id, u32 offset, u32 length
+#   entry    u16 rows, u16 cols, u16 blob count, u16 next level (0 = last),
+#            u8 background name length, background name (utf-8),
+#            rows * cols tile bytes, row-major
+#
+# Rebuild it from the editable JSON source with:
+#
+#     python level_pack.py [source.json] [output.pack]
+
+MAGIC = b"NJLP"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+INDEX_ENTRY = struct.Struct("<HII")
+LEVEL_HEADER = struct.Struct("<HHHHB")
+
+
+class LevelDef:
+    __slots__ = ("id", "grid", "background", "blob_count", "next_level")
+
+    def __init__(self, level_id, grid, background, blob_count, next_level):
+        self.id = level_id
+        self.grid = grid
+        self.background = background
+        self.blob_count = blob_count
+        self.next_level = next_level
+
+
+def encode_level(level):
+    rows = len(level["grid"])
+    cols = len(level["grid"][0]) if rows else 0
+    if any(len(row) != cols for row in level["grid"]):
+        raise ValueError(f"Level {level['id']} is not rectangular.")
+    background = level["background"].encode("utf-8")
+    cells = bytes(int(ch) for row in level["grid"] for ch in row)
+    return LEVEL_HEADER.pack(rows, cols, level["blobs"], level["next"], len(background)) + background + cells
+
+
+def build_pack(source_path=LEVEL_SOURCE, pack_path=LEVEL_PACK):
+    with open(source_path) as f:
+        levels = sorted(json.load(f), key=lambda level: level["id"])
+    blobs = [encode_level(level) for level in levels]
+    offset = HEADER.size + INDEX_ENTRY.size * len(levels)
+    index = b""
+    for level, blob in zip(levels, blobs):
+        index += INDEX_ENTRY.pack(level["id"], offset, len(blob))
+        offset += len(blob)
+    tmp_path = pack_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(levels)))
+        f.write(index)
+        f.writelines(blobs)
+    os.replace(tmp_path, pack_path)
+    print(f"{len(levels)} levels -> {pack_path} ({offset} bytes)")
+
+
+class LevelRegistry:
+    # Reads levels on demand from a memory-mapped pack. Opening it parses
+    # only the index; a level's grid is decoded when get() asks for it.
+    def __init__(self, pack_path=LEVEL_PACK):
+        self.path = pack_path
+        self._file = open(pack_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{pack_path} is not a version {VERSION} level pack.")
+        self._index = {}
+        for i in range(count):
+            level_id, offset, length = INDEX_ENTRY.unpack_from(self._map, HEADER.size + i * INDEX_ENTRY.size)
+            self._index[level_id] = (offset, length)
+
+    def ids(self):
+        return sorted(self._index)
+
+    def __contains__(self, level_id):
+        return level_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, level_id):
+        try:
+            offset, length = self._index[level_id]
+        except KeyError:
+            raise KeyError(f"No level {level_id} in {self.path}.") from None
+        rows, cols, blob_count, next_level, name_len = LEVEL_HEADER.unpack_from(self._map, offset)
+        pos = offset + LEVEL_HEADER.size
+        background = self._map[pos:pos + name_len].decode("utf-8")
+        pos += name_len
+        cells = self._map[pos:pos + rows * cols]
+        grid = [bytearray(cells[r * cols:(r + 1) * cols]) for r in range(rows)]
+        return LevelDef(level_id, grid, background, blob_count, next_level)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+_registry = None
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        _registry = LevelRegistry()
+    return _registry
+
+
+if __name__ == "__main__":
+    build_pack(*sys.argv[1:3])
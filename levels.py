@@ -1,17 +1,29 @@
 import sys
-import random
 import pygame
 import os
+import numpy as np
 
 from player import Ninja
+from assets import SurfaceCache, surface_bytes, load_image, get_font, render_text_surface
+from render import DirtyRectRenderer
+from collision import TileGrid
+from camera import Camera
+from enemies import BlobManager
+from broadphase import TriggerGrid
+from level_pack import get_registry
+from audio import play_effect
+from profiler import get_profiler
+from display import get_display
+from savegame import get_save_manager
+from replay import Replay
+from constants import (WIDTH, HEIGHT, DIRTY_RECT_RENDERING, SOLID_TILES, SIM_TICK_MS, RENDER_FPS, MAX_FRAME_MS,
+                       CHUNK_TILES, CHUNK_CACHE_BUDGET, ACTIVE_MARGIN_CHUNKS, REPLAY_RECORDING)
 import game_data
 
 tile_size = 50
-screen_width = 1920
-screen_height = 1080
 
 def initialize_screen():
-    screen = pygame.display.set_mode((screen_width, screen_height))
+    screen = get_display().open()
     pygame.display.set_caption('Escape the Maze')
     return screen
 
@@ -22,453 +34,490 @@ MIN_DOOR_DIST_TILES = 2
 MIN_VERTICAL_CLEARANCE = 2
 MIN_BLOB_HORIZONTAL_GAP = 2
 
-def place_random_blobs_fair(num_blobs, base_world_data):
-    data_copy = [row[:] for row in base_world_data]
-    rows = len(data_copy)
-    cols = len(data_copy[0]) if rows > 0 else 0
-    range_in_tiles = BLOB_MOVE_RANGE // TILE_SIZE
-
-    spawn_r = spawn_c = None
-    door_r = door_c = None
-    for rr in range(rows):
-        for cc in range(cols):
-            val = data_copy[rr][cc]
-            if val == 9:
-                spawn_r, spawn_c = rr, cc
-            elif val == 7:
-                door_r, door_c = rr, cc
-
-    possible_positions = []
-    for r in range(2, rows - 1):
-        for c in range(cols - range_in_tiles):
-            row_open = True
-            for step in range(range_in_tiles + 1):
-                if data_copy[r][c + step] != 0:
-                    row_open = False
-                    break
-            if not row_open:
-                continue
-
-            supported = True
-            for step in range(range_in_tiles + 1):
-                below_tile = data_copy[r + 1][c + step]
-                if below_tile not in [1, 2]:
-                    supported = False
-                    break
-            if not supported:
-                continue
-
-            enough_headroom = True
-            for step in range(range_in_tiles + 1):
-                if data_copy[r - 1][c + step] != 0 or data_copy[r - 2][c + step] != 0:
-                    enough_headroom = False
-                    break
-            if not enough_headroom:
-                continue
-
-            if spawn_r is not None:
-                dist_spawn = abs(r - spawn_r) + abs(c - spawn_c)
-                if dist_spawn < MIN_SPAWN_DIST_TILES:
-                    continue
-
-            if door_r is not None:
-                dist_door = abs(r - door_r) + abs(c - door_c)
-                if dist_door < MIN_DOOR_DIST_TILES:
-                    continue
-
-            possible_positions.append((r, c))
-
+TILE_IMAGES = {1: 'dirt.png', 2: 'grass.png', 4: 'lava.png', 7: 'door.png'}
+COIN_IMAGE = 'coin.png'
+COIN_SIZE = (35, 35)
+BLOB_IMAGE = 'blob1.png'
+BLOB_SIZE = (tile_size - 10, tile_size - 10)
+
+
+def level_images(level):
+    # Every (filename, size) that building and drawing the level loads.
+    return ([(level.background, (WIDTH, HEIGHT))]
+            + [(name, (tile_size, tile_size)) for name in TILE_IMAGES.values()]
+            + [(COIN_IMAGE, COIN_SIZE), (BLOB_IMAGE, BLOB_SIZE)])
+
+def _run_of(mask, span):
+    # True where `span` consecutive cells starting at that column are all set.
+    width = mask.shape[1] - span + 1
+    run = mask[:, :width].copy()
+    for step in range(1, span):
+        run &= mask[:, step:step + width]
+    return run
+
+
+def find_blob_candidates(grid):
+    # Top-left cells of every (row, col) where a blob fits: a run of
+    # range_in_tiles + 1 empty cells standing on dirt/grass with two empty
+    # rows above it, away from the spawn and the door. Rows come back in
+    # row-major order, as the old per-cell loop produced them.
+    grid = np.asarray(grid, dtype=np.int8)
+    rows, cols = grid.shape
+    span = BLOB_MOVE_RANGE // TILE_SIZE + 1
+    if rows < 4 or cols < span:
+        return np.empty((0, 2), dtype=np.intp)
+
+    open_run = _run_of(grid == 0, span)
+    solid_run = _run_of((grid == 1) | (grid == 2), span)
+
+    fits = np.zeros(open_run.shape, dtype=bool)
+    fits[2:rows - 1] = (open_run[2:rows - 1] & solid_run[3:rows]
+                        & open_run[1:rows - 2] & open_run[0:rows - 3])
+    candidates = np.argwhere(fits)
+
+    for value, min_dist in ((9, MIN_SPAWN_DIST_TILES), (7, MIN_DOOR_DIST_TILES)):
+        found = np.argwhere(grid == value)
+        if len(found) and len(candidates):
+            dist = np.abs(candidates - found[-1]).sum(axis=1)
+            candidates = candidates[dist >= min_dist]
+    return candidates
+
+
+def choose_blob_spots(candidates, num_blobs, rng):
     chosen_spots = []
-    random.shuffle(possible_positions)
-    for (r, c) in possible_positions:
+    taken = {}
+    for index in rng.permutation(len(candidates)):
         if len(chosen_spots) >= num_blobs:
             break
-        conflict = False
-        for (rb, cb) in chosen_spots:
-            if rb == r and abs(c - cb) < MIN_BLOB_HORIZONTAL_GAP:
-                conflict = True
-                break
-        if not conflict:
-            chosen_spots.append((r, c))
+        r, c = (int(v) for v in candidates[index])
+        row_taken = taken.setdefault(r, set())
+        if any(c + d in row_taken for d in range(1 - MIN_BLOB_HORIZONTAL_GAP, MIN_BLOB_HORIZONTAL_GAP)):
+            continue
+        row_taken.add(c)
+        chosen_spots.append((r, c))
+    return chosen_spots
+
+
+def sample_blob_placements(num_blobs, base_world_data, count, seed=None):
+    # `count` independent placements from one candidate search. The same
+    # seed always gives the same placements.
+    candidates = find_blob_candidates(base_world_data)
+    rng = np.random.default_rng(seed)
+    return [choose_blob_spots(candidates, num_blobs, rng) for _ in range(count)]
+
 
+def place_random_blobs_fair(num_blobs, base_world_data, seed=None):
+    data_copy = [row[:] for row in base_world_data]
+    chosen_spots = sample_blob_placements(num_blobs, base_world_data, 1, seed)[0]
     for (r, c) in chosen_spots:
         data_copy[r][c] = 3
-
     return data_copy
 
-class Blob:
-    def __init__(self, x, y, move_range, solid_tiles):
-        self.image = pygame.image.load('assets/images/blob1.png')
-        self.image = pygame.transform.scale(self.image, (tile_size - 10, tile_size - 10))
-        self.rect = self.image.get_rect(topleft=(x + 5, y + 5))
-        self.start_x = x
-        self.move_range = move_range
-        self.direction = 1
-        self.solid_tiles = solid_tiles
-
-    def update(self):
-        next_rect = self.rect.copy()
-        next_rect.x += self.direction
-        collided = False
-        for tile_rect in self.solid_tiles:
-            if next_rect.colliderect(tile_rect):
-                collided = True
-                break
-        if collided:
-            self.direction *= -1
-        else:
-            self.rect = next_rect
-        if self.rect.x > self.start_x + self.move_range or self.rect.x < self.start_x:
-            self.direction *= -1
+def _last_in_grid(grid, value):
+    # (row, col) of the last cell holding `value` in row-major order.
+    for row in range(len(grid) - 1, -1, -1):
+        cells = grid[row]
+        if value in cells:
+            return row, len(cells) - 1 - cells[::-1].index(value)
+    return None
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
 
 class World:
-    def __init__(self, data, offset_x, offset_y):
-        self.tile_list = []
-        self.lava_tiles = []
-        self.coins = []
-        self.blobs = []
-        self.spawn_pos = None
-        self.exit_pos = None
-        self.solid_tiles = []
-        dirt_img = pygame.image.load('assets/images/dirt.png')
-        grass_img = pygame.image.load('assets/images/grass.png')
-        exit_img = pygame.image.load('assets/images/door.png')
-        lava_img = pygame.image.load('assets/images/lava.png')
-        coin_img = pygame.image.load('assets/images/coin.png')
-
-        for row_count, row in enumerate(data):
-            for col_count, tile in enumerate(row):
-                x = offset_x + col_count * tile_size
-                y = offset_y + row_count * tile_size
-                if tile == 1:
-                    img = pygame.transform.scale(dirt_img, (tile_size, tile_size))
-                    rect = img.get_rect(topleft=(x, y))
-                    self.tile_list.append((img, rect))
-                    self.solid_tiles.append(rect)
-                elif tile == 2:
-                    img = pygame.transform.scale(grass_img, (tile_size, tile_size))
-                    rect = img.get_rect(topleft=(x, y))
-                    self.tile_list.append((img, rect))
-                    self.solid_tiles.append(rect)
-                elif tile == 3:
-                    blob = Blob(x, y, BLOB_MOVE_RANGE, self.solid_tiles)
-                    self.blobs.append(blob)
-                elif tile == 4:
-                    img = pygame.transform.scale(lava_img, (tile_size, tile_size))
-                    rect = img.get_rect(topleft=(x, y))
-                    self.lava_tiles.append(rect)
-                    self.tile_list.append((img, rect))
-                elif tile == 5:
-                    img = pygame.transform.scale(coin_img, (35, 35))
-                    coin_rect = img.get_rect(topleft=(x, y))
-                    self.coins.append((img, coin_rect))
-                elif tile == 7:
-                    img = pygame.transform.scale(exit_img, (tile_size, tile_size))
-                    rect = img.get_rect(topleft=(x, y))
-                    self.exit_pos = (x, y)
-                    self.tile_list.append((img, rect))
-                elif tile == 9:
-                    self.spawn_pos = (x, y)
-        if self.spawn_pos is None:
+    def __init__(self, data, offset_x, offset_y, background=None, size=(WIDTH, HEIGHT),
+                 headless=False):
+        # The level is split into chunks of CHUNK_TILES x CHUNK_TILES tiles.
+        # A chunk's tiles are pre-rendered the first time it is on screen
+        # and dropped again once it is out of view; its coins and blobs are
+        # created the first time the player comes near it. Nothing is built
+        # per tile up front, so cost follows the view, not the level size.
+        # A headless world never touches image files, for simulation without
+        # a display (see engine.py).
+        # One bytearray per row: a byte per tile instead of a pointer to an int.
+        self.data = [bytearray(row) for row in data]
+        self.headless = headless
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.background = background
+        self.size = size
+        self.rows = len(self.data)
+        self.cols = max((len(row) for row in self.data), default=0)
+        self.bounds = pygame.Rect(offset_x, offset_y, self.cols * tile_size, self.rows * tile_size)
+        self.tile_grid = TileGrid(offset_x, offset_y, tile_size, self.data)
+        self.chunk_size = CHUNK_TILES * tile_size
+        if headless:
+            self.tile_images = dict.fromkeys(TILE_IMAGES)
+            self.coin_image = None
+            blob_image = None
+        else:
+            self.tile_images = {tile: load_image(name, (tile_size, tile_size))
+                                for tile, name in TILE_IMAGES.items()}
+            self.coin_image = load_image(COIN_IMAGE, COIN_SIZE)
+            blob_image = load_image(BLOB_IMAGE, BLOB_SIZE)
+        self.blobs = BlobManager(self.data, (offset_x, offset_y), tile_size, BLOB_SIZE, BLOB_MOVE_RANGE,
+                                 SOLID_TILES, blob_image)
+        self.chunk_surfaces = SurfaceCache(CHUNK_CACHE_BUDGET)
+        self.chunk_blobs = {}
+        self.active_key = None
+        # Coins and the door, for player-versus-trigger checks and for
+        # drawing the coins on screen.
+        self.triggers = TriggerGrid(tile_size)
+        self.static_layer = None
+        self.static_view = None
+        self.static_dirty = True
+
+        spawn = _last_in_grid(self.data, 9)
+        if spawn is None:
             raise ValueError("No spawn position (tile=9) found in level data.")
-
-    def draw(self, screen):
-        for tile in self.tile_list:
-            screen.blit(tile[0], tile[1])
-        for coin in self.coins:
-            screen.blit(coin[0], coin[1])
-        for blob in self.blobs:
-            blob.draw(screen)
-
-def run_level(screen, clock, level_background, world_data, level_status, next_level):
-    print("DEBUG: Entered run_level()")
+        self.spawn_pos = self.tile_pos(*spawn)
+        door = _last_in_grid(self.data, 7)
+        self.exit_pos = self.tile_pos(*door) if door else None
+        if self.exit_pos:
+            door_rect = pygame.Rect(self.exit_pos[0] + 10, self.exit_pos[1] + 5, tile_size - 20, tile_size - 10)
+            self.triggers.add(door_rect, "door")
+
+    def tile_pos(self, row, col):
+        return self.offset_x + col * tile_size, self.offset_y + row * tile_size
+
+    def chunk_span(self, rect):
+        # (first_row, last_row, first_col, last_col) of the chunks `rect` touches.
+        size = self.chunk_size
+        last_row = (self.rows - 1) // CHUNK_TILES
+        last_col = (self.cols - 1) // CHUNK_TILES
+        return (max((rect.top - self.offset_y) // size, 0),
+                min((rect.bottom - 1 - self.offset_y) // size, last_row),
+                max((rect.left - self.offset_x) // size, 0),
+                min((rect.right - 1 - self.offset_x) // size, last_col))
+
+    def _chunks(self, span):
+        first_row, last_row, first_col, last_col = span
+        return [(r, c) for r in range(first_row, last_row + 1) for c in range(first_col, last_col + 1)]
+
+    def _spawn_entities(self, chunk):
+        blobs = []
+        chunk_row, chunk_col = chunk
+        for row in range(chunk_row * CHUNK_TILES, min((chunk_row + 1) * CHUNK_TILES, self.rows)):
+            cells = self.data[row]
+            for col in range(chunk_col * CHUNK_TILES, min((chunk_col + 1) * CHUNK_TILES, len(cells))):
+                tile = cells[col]
+                if tile == 3:
+                    blobs.append(self.tile_pos(row, col))
+                elif tile == 5:
+                    self.triggers.add(pygame.Rect(*self.tile_pos(row, col), *COIN_SIZE), "coin", self.coin_image)
+        indices = self.blobs.add(blobs)
+        self.chunk_blobs[chunk] = indices
+        return indices
+
+    def activate(self, center):
+        # Coins and blobs are simulated within a view's size of `center`
+        # (the player) plus a margin; anything the camera can show is
+        # inside that area. Called every tick; only does work when the
+        # player crosses into another chunk.
+        margin = ACTIVE_MARGIN_CHUNKS * self.chunk_size
+        area = pygame.Rect(0, 0, 2 * (self.size[0] + margin), 2 * (self.size[1] + margin))
+        area.center = center
+        span = self.chunk_span(area)
+        if span == self.active_key:
+            return
+        self.active_key = span
+        blobs = []
+        for chunk in self._chunks(span):
+            chunk_blobs = self.chunk_blobs.get(chunk)
+            if chunk_blobs is None:
+                chunk_blobs = self._spawn_entities(chunk)
+            blobs.append(chunk_blobs)
+        # Far enough off the map no chunk is in range, and nothing is active.
+        self.blobs.set_active(np.concatenate(blobs) if blobs else np.empty(0, dtype=np.intp))
+
+    def query_counts(self):
+        # Broadphase work since the last reset_query_counts().
+        return {
+            "trigger queries": self.triggers.queries,
+            "trigger candidates": self.triggers.candidates,
+            "blob queries": self.blobs.sweep.queries,
+            "blob candidates": self.blobs.sweep.candidates,
+        }
+
+    def reset_query_counts(self):
+        self.triggers.reset_counts()
+        self.blobs.sweep.reset_counts()
+
+    def memory_usage(self):
+        # Bytes held by this world, by part. Tile, coin and blob images are
+        # shared through the image cache and not counted here.
+        usage = {
+            "grid": sys.getsizeof(self.data) + sum(sys.getsizeof(row) for row in self.data),
+            "blobs": self.blobs.nbytes(),
+            "triggers": self.triggers.nbytes(),
+            "chunks": self.chunk_surfaces.used_bytes,
+            "static layer": surface_bytes(self.static_layer) if self.static_layer else 0,
+        }
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def set_tile(self, row, col, value):
+        old = self.data[row][col]
+        if old == value:
+            return
+        self.data[row][col] = value
+        self.blobs.set_solid(row, col, value in SOLID_TILES)
+        if old in self.tile_images or value in self.tile_images:
+            self.chunk_surfaces.discard((row // CHUNK_TILES, col // CHUNK_TILES))
+            self.static_dirty = True
+
+    def chunk_surface(self, chunk):
+        entry = self.chunk_surfaces.get(chunk)
+        if entry is not None:
+            return entry[0]
+        chunk_row, chunk_col = chunk
+        first_row, first_col = chunk_row * CHUNK_TILES, chunk_col * CHUNK_TILES
+        rows = range(first_row, min(first_row + CHUNK_TILES, self.rows))
+        width = min(CHUNK_TILES, self.cols - first_col) * tile_size
+        surface = pygame.Surface((width, len(rows) * tile_size), pygame.SRCALPHA)
+        tiles = []
+        for row in rows:
+            cells = self.data[row]
+            for col in range(first_col, min(first_col + CHUNK_TILES, len(cells))):
+                if cells[col] in self.tile_images:
+                    tiles.append((self.tile_images[cells[col]],
+                                  ((col - first_col) * tile_size, (row - first_row) * tile_size)))
+        surface.blits(tiles, doreturn=False)
+        converted = pygame.display.get_surface() is not None
+        if converted:
+            surface = surface.convert_alpha()
+        self.chunk_surfaces.put(chunk, surface, converted)
+        return surface
+
+    def render_static_layer(self, view=(0, 0)):
+        # Background and the tiles on screen composited once; redrawn only
+        # when the camera moves or a tile changes. The background stays
+        # fixed to the screen.
+        if self.static_layer is None or self.static_layer.get_size() != self.size:
+            self.static_layer = pygame.Surface(self.size)
+            if pygame.display.get_surface() is not None:
+                self.static_layer = self.static_layer.convert()
+        if self.background is None:
+            self.static_layer.fill((0, 0, 0))
+        elif self.background.get_size() != self.size:
+            self.static_layer.blit(pygame.transform.scale(self.background, self.size), (0, 0))
+        else:
+            self.static_layer.blit(self.background, (0, 0))
+
+        visible = self._chunks(self.chunk_span(pygame.Rect(view, self.size)))
+        self.static_layer.blits(
+            [(self.chunk_surface(chunk),
+              (self.offset_x + chunk[1] * self.chunk_size - view[0],
+               self.offset_y + chunk[0] * self.chunk_size - view[1]))
+             for chunk in visible],
+            doreturn=False)
+        if pygame.Rect(view, self.size).contains(self.bounds):
+            # The whole level is in the static layer; chunks are cheap to
+            # rebuild if the view or a tile ever changes.
+            self.chunk_surfaces.clear()
+        else:
+            # Chunks that scrolled out of view give their surfaces back.
+            for chunk in self.chunk_surfaces.keys():
+                if chunk not in visible:
+                    self.chunk_surfaces.discard(chunk)
+        self.static_view = view
+        self.static_dirty = False
+
+    def refresh_static_layer(self, view=(0, 0)):
+        # True when the static layer had to be redrawn.
+        if self.static_dirty or view != self.static_view:
+            self.render_static_layer(view)
+            return True
+        return False
+
+    def draw(self, screen, alpha=1.0, view=(0, 0)):
+        self.refresh_static_layer(view)
+        screen.blit(self.static_layer, (0, 0))
+        self.draw_dynamic(screen, alpha, view)
+
+    def draw_dynamic(self, screen, alpha=1.0, view=(0, 0)):
+        on_screen = pygame.Rect(view, self.size)
+        for coin_rect, _, coin_img in self.triggers.visible(on_screen, "coin"):
+            screen.blit(coin_img, coin_rect.move(-view[0], -view[1]))
+        self.blobs.draw(screen, alpha, view, self.size)
+
+
+class StepResult:
+    __slots__ = ("coins", "died", "reached_door")
+
+    def __init__(self):
+        self.coins = 0
+        self.died = None
+        self.reached_door = False
+
+
+def level_offset():
+    # Levels are laid out in a 1000x800 play area centred on the screen.
+    return (WIDTH - 1000) // 2, (HEIGHT - 800) // 2
+
+
+def step_level(world, player, keys, profiler=None):
+    # One fixed simulation tick. Shared by run_level and the headless
+    # engine; side effects such as sounds and global coin totals are left
+    # to the caller.
+    result = StepResult()
+    world.activate(player.rect.center)
+    world.blobs.update()
+    if profiler:
+        profiler.lap("blobs")
+    for coin_id, _, _ in world.triggers.query(player.rect, "coin"):
+        world.triggers.remove(coin_id)
+        result.coins += 1
+    if profiler:
+        profiler.lap("coins")
+    result.died = player.update(
+        keys=keys,
+        tile_grid=world.tile_grid,
+        blobs=world.blobs,
+        dt_ms=SIM_TICK_MS
+    )
+    if not result.died and world.triggers.query(player.rect, "door"):
+        result.reached_door = True
+    if profiler:
+        profiler.lap("player")
+    return result
+
+
+def new_seed():
+    # Seed for a level's blob placement, kept so a replay can redo it.
+    return int.from_bytes(os.urandom(4), "little")
+
+
+def prepare_world_data(level, seed=None):
+    if level.blob_count:
+        return place_random_blobs_fair(level.blob_count, level.grid, seed)
+    return level.grid
+
+
+def run_level(screen, clock, level_id, level_status, prepared=None,
+              dirty_rects=DIRTY_RECT_RENDERING, render_fps=RENDER_FPS, replay=None, record=REPLAY_RECORDING):
+    # `prepared` is an optional PreparedLevel from the prefetcher, whose
+    # images are already in the cache. With a Replay the level is played
+    # from its input instead of the keyboard; with `record` the run's
+    # input is saved as a replay when it ends.
+    print(f"DEBUG: Entered run_level({level_id})")
     print(f"[DEBUG] Selected skin: {game_data.selected_skin}")
-    offset_x = (screen_width - 1000) // 2
-    offset_y = (screen_height - 800) // 2
-    world = World(world_data, offset_x, offset_y)
-    player = Ninja(*world.spawn_pos, skin=game_data.selected_skin)
+    skin = game_data.selected_skin
+    if replay is not None:
+        level, seed, skin = get_registry().get(replay.level_id), replay.seed, replay.skin
+        world_data = prepare_world_data(level, seed)
+        replay_inputs = replay.inputs()
+        record = False
+    elif prepared is not None and prepared.level.id == level_id:
+        level, world_data, seed = prepared.level, prepared.world_data, prepared.seed
+    else:
+        level, seed = get_registry().get(level_id), new_seed()
+        world_data = prepare_world_data(level, seed)
+    recording = Replay(level.id, seed, skin) if record else None
+    level_background = load_image(level.background, (WIDTH, HEIGHT))
+    offset_x, offset_y = level_offset()
+    world = World(world_data, offset_x, offset_y, level_background)
+    player = Ninja(*world.spawn_pos, skin=skin)
+    camera = Camera((WIDTH, HEIGHT), world.bounds)
     level_coins = 0
-    font = pygame.font.SysFont(None, 36)
+    font = get_font(None, 36)
+    renderer = DirtyRectRenderer(screen) if dirty_rects else None
+    target = renderer or screen
+    profiler = get_profiler()
+    display = get_display()
+    scene = f"level {level_id}"
+    # Gameplay advances in fixed SIM_TICK_MS steps no matter how fast frames
+    # are drawn; leftover time carries over and is used to interpolate.
+    clock.tick()
+    accumulator = SIM_TICK_MS
+    memory_reported = False
+
+    def end(completed):
+        if recording is not None:
+            recording.save()
+        return completed
+
     run = True
     while run:
-        screen.blit(pygame.transform.scale(level_background, (screen_width, screen_height)), (0, 0))
-        world.draw(screen)
-        for blob in world.blobs:
-            blob.update()
-        for i in range(len(world.coins) - 1, -1, -1):
-            coin_img, coin_rect = world.coins[i]
-            if player.rect.colliderect(coin_rect):
-                world.coins.pop(i)
-                level_coins += 1
-                game_data.coins_collected += 1
-                coin_sound = pygame.mixer.Sound("assets/sounds/coin.mp3")
-                coin_sound.set_volume(0.5)
-                coin_sound.play()
+        profiler.begin_frame(scene)
+        keys = pygame.key.get_pressed()
+        profiler.lap("input")
+        while accumulator >= SIM_TICK_MS:
+            accumulator -= SIM_TICK_MS
+            if replay is not None:
+                keys = next(replay_inputs, None)
+                if keys is None:
+                    print("[DEBUG] Replay finished")
+                    profiler.discard_frame()
+                    return False
+            elif recording is not None:
+                recording.record(keys)
+            result = step_level(world, player, keys, profiler)
+            if recording is not None:
+                recording.observe(result)
+            if result.coins:
+                level_coins += result.coins
+                game_data.coins_collected += result.coins
+                get_save_manager().save()
+                play_effect("coin")
 
                 print(f"DEBUG: Player picked a coin -> level: {level_coins}, global: {game_data.coins_collected}")
-        door_rect = None
-        if world.exit_pos:
-            door_rect = pygame.Rect(
-                world.exit_pos[0] + 10,
-                world.exit_pos[1] + 5,
-                tile_size - 20,
-                tile_size - 10
-            )
-        game_over = player.update(
-            keys=pygame.key.get_pressed(),
-            tile_list=[tile[1] for tile in world.tile_list],
-            lava_tiles=world.lava_tiles,
-            blob_tiles=[b.rect for b in world.blobs],
-            door_rect=door_rect
-        )
-        if game_over:
-            print("Game Over! Player died.")
-            return False
-        if door_rect and player.rect.colliderect(door_rect):
-            print("Level Completed!")
-            return True
-        player.draw(screen)
-        pygame.font.init()
-        font = pygame.font.Font(None, 36)
-        text_bg_rect = pygame.Rect(screen_width - 600, screen_height - 180, 175, 100)
-        pygame.draw.rect(screen, (1, 50, 32), text_bg_rect)
+            if result.died:
+                print("Game Over! Player died.")
+                profiler.discard_frame()
+                return end(False)
+            if result.reached_door:
+                print("Level Completed!")
+                profiler.discard_frame()
+                return end(True)
+            profiler.lap("game")
+        alpha = accumulator / SIM_TICK_MS
+        camera.follow(player.draw_rect(alpha).center)
+        view = camera.offset
+
+        if renderer:
+            if world.refresh_static_layer(view):
+                renderer.invalidate()
+            renderer.begin(world.static_layer)
+            world.draw_dynamic(renderer, alpha, view)
+        else:
+            world.draw(screen, alpha, view)
+        profiler.lap("world draw")
+        player.draw(target, alpha, view)
+        profiler.lap("player draw")
+        text_bg_rect = pygame.Rect(WIDTH - 600, HEIGHT - 180, 175, 100)
+        target.fill((1, 50, 32), text_bg_rect)
         #level_text = font.render(f"Coins this level: {level_coins}", True, (0, 0, 0))
-        #screen.blit(level_text, (screen_width - 590, screen_height - 160))
-        global_text = font.render(f"Coins: {game_data.coins_collected}", True, (255, 255, 255))
-        screen.blit(global_text, (screen_width - 590, screen_height - 150))
-        pygame.display.update()
+        #screen.blit(level_text, (WIDTH - 590, HEIGHT - 160))
+        global_text = render_text_surface(f"Coins: {game_data.coins_collected}", font, (255, 255, 255))
+        target.blit(global_text, (WIDTH - 590, HEIGHT - 150))
+        profiler.lap("hud")
+        profiler.draw_overlay(target)
+        profiler.lap("overlay")
+        if renderer:
+            renderer.present()
+        else:
+            display.present()
+        profiler.lap("flip")
+        display.adapt(profiler.elapsed_ms())
+        if memory_reported is False:
+            # After the first frame, once the visible chunks exist.
+            memory_reported = True
+            usage = world.memory_usage()
+            print(f"[DEBUG] Level {level_id} memory: {usage['total'] / 1024:.1f} KiB "
+                  + ", ".join(f"{name} {size / 1024:.1f}" for name, size in usage.items() if name != "total"))
         for event in pygame.event.get():
+            profiler.handle_event(event)
             if event.type == pygame.QUIT:
                 run = False
+                end(False)
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 run = False
-        pygame.display.update()
-        clock.tick(60)
-    return False
-
-def level_one_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    world_data = [
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 7, 1],
-        [1, 0, 0, 0, 2, 2, 2, 0, 0, 0, 0, 5, 0, 0, 0, 5, 2, 2, 2, 1],
-        [1, 9, 0, 2, 1, 1, 1, 2, 0, 0, 2, 2, 2, 0, 0, 2, 1, 1, 1, 1],
-        [1, 2, 2, 1, 1, 1, 1, 1, 2, 2, 1, 1, 1, 2, 2, 1, 1, 1, 1, 1]
-    ]
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=2)
-
-def level_two_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    world_data = [
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 2, 2, 5, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 2, 2, 2, 2, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 2, 2, 2, 2, 0, 5, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 2, 2, 2, 0, 0, 0, 5, 1],
-        [1, 0, 0, 0, 2, 2, 2, 2, 0, 0, 0, 0, 0, 0, 0, 0, 2, 2, 2, 1],
-        [1, 9, 0, 2, 1, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0, 2, 1, 1, 1, 1],
-        [1, 2, 2, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1]
-    ]
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=3)
-
-def level_three_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    world_data = [
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 5, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 9, 1, 0, 0, 0, 1, 0, 2, 2, 2, 2, 2, 2, 0, 1],
-        [1, 0, 0, 0, 2, 2, 1, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 1, 5, 1],
-        [1, 0, 0, 2, 1, 0, 0, 0, 5, 0, 2, 2, 1, 0, 1, 0, 0, 1, 0, 1],
-        [1, 0, 5, 0, 0, 0, 2, 2, 2, 2, 0, 0, 0, 0, 1, 0, 0, 1, 5, 1],
-        [1, 2, 2, 2, 2, 2, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1],
-        [1, 7, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 2, 2, 2, 1],
-        [1, 2, 2, 2, 2, 5, 0, 1, 0, 5, 5, 0, 0, 0, 1, 5, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 2, 0, 1, 0, 2, 2, 2, 0, 0, 1, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1]
-    ]
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=4)
-
-def level_four_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    world_data = [
-        [1, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 1, 5, 0, 2, 2, 2, 2, 2, 2, 2, 2, 2, 0, 1],
-        [1, 0, 0, 0, 0, 9, 1, 2, 0, 1, 0, 0, 0, 5, 0, 0, 0, 5, 0, 1],
-        [1, 0, 2, 2, 2, 2, 1, 0, 0, 1, 0, 2, 2, 2, 2, 2, 2, 2, 2, 1],
-        [1, 0, 5, 0, 5, 0, 5, 0, 2, 1, 0, 0, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 7, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 5, 1],
-        [1, 0, 0, 0, 2, 2, 2, 2, 1, 0, 0, 5, 0, 0, 5, 0, 0, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 2, 2, 2, 2, 2, 2, 0, 1, 5, 1],
-        [1, 2, 2, 2, 2, 0, 0, 0, 1, 5, 0, 1, 5, 0, 0, 0, 5, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 1, 2, 0, 1, 2, 2, 0, 0, 2, 1, 5, 1],
-        [1, 0, 2, 2, 2, 2, 2, 2, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 2, 2, 2, 0, 0, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1]
-    ]
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=4)
-
-
-def level_five_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    world_data = [
-        [1, 7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 5, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 5, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 1],
-        [1, 0, 0, 0, 0, 5, 0, 0, 0, 5, 0, 0, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 2, 2, 0, 0, 2, 0, 0, 2, 0, 0, 2, 2, 2, 2, 1],
-        [1, 0, 0, 5, 2, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 2, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 1, 2, 2, 0, 2, 2, 2, 2, 2, 0, 2, 2, 2, 2, 2, 0, 0, 5, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1],
-        [1, 0, 0, 0, 0, 0, 5, 0, 0, 0, 5, 0, 0, 0, 5, 0, 0, 2, 1, 1],
-        [1, 9, 0, 0, 0, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1],
-        [1, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-    ]
-
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=6)
-
-def level_six_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    world_data = [
-        [1, 7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 5, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 1],
-        [1, 0, 0, 0, 0, 5, 0, 0, 0, 5, 0, 0, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 2, 2, 4, 4, 2, 4, 4, 2, 4, 4, 2, 2, 2, 2, 1],
-        [1, 0, 0, 5, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 0, 0, 2, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 1],
-        [1, 1, 2, 2, 0, 2, 2, 2, 2, 0, 0, 2, 2, 2, 2, 2, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 9, 0, 0, 0, 2, 2, 2, 2, 4, 4, 2, 2, 2, 4, 4, 2, 2, 2, 1],
-        [1, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-    ]
-
-
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=7)
-
-
-def level_seven_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    base_world_data = [
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 7, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 2, 2, 2, 2, 1],
-        [1, 0, 0, 5, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1, 1, 1],
-        [1, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 5, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 5, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 2, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 5, 0, 0, 0, 1],
-        [1, 1, 2, 2, 0, 2, 2, 2, 2, 0, 0, 2, 2, 2, 2, 2, 0, 0, 5, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 1, 1],
-        [1, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 9, 0, 0, 0, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1],
-        [1, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-    ]
-    world_data = place_random_blobs_fair(3, base_world_data)
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=8)
-
-def level_eight_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    base_world_data = [
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 2, 2, 0, 0, 0, 0, 0, 1],
-        [1, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 1],
-        [1, 2, 2, 2, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 5, 1],
-        [1, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 2, 1],
-        [1, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 2, 1, 1],
-        [1, 0, 0, 0, 0, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 1],
-        [1, 5, 0, 0, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 2, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 2, 2, 2, 2, 2, 2, 4, 4, 4, 4, 4, 2, 2, 9, 1],
-        [1, 2, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 1]
-    ]
-    world_data = place_random_blobs_fair(3, base_world_data)
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=9)
-
-def level_nine_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    base_world_data = [
-        [1, 9, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 0, 5, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 1, 2, 2, 4, 4, 2, 2, 0, 0, 0, 0, 5, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 2, 2, 2, 2, 2, 2, 2, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 5, 0, 0, 0, 0, 0, 0, 0, 0, 2, 2, 2, 5, 0, 0, 0, 0, 5, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 2, 4, 4, 2, 2, 2, 2, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 1, 5, 0, 0, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 5, 0, 0, 6, 0, 0, 2, 2, 1, 0, 0, 0, 0, 0, 0, 7, 1],
-        [1, 0, 2, 2, 2, 2, 4, 4, 2, 2, 2, 1, 5, 1, 0, 0, 0, 0, 2, 2, 2, 1],
-        [1, 0, 0, 0, 0, 1, 1, 1, 1, 5, 0, 0, 0, 1, 2, 2, 2, 0, 0, 0, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-    ]
-    world_data = place_random_blobs_fair(3, base_world_data)
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=10)
-
-def level_ten_screen(screen, clock, level_status):
-    level_background = pygame.image.load('assets/images/level_background.png')
-    base_world_data = [
-        [1, 9, 0, 5, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 2, 2, 2, 2, 2, 2, 0, 0, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 5, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 5, 0, 0, 0, 0, 0, 0, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 2, 2, 2, 2, 4, 4, 2, 2, 5, 0, 0, 0, 0, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 1, 2, 2, 0, 0, 0, 1, 0, 1],
-        [1, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 5, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 2, 2, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 5, 0, 0, 0, 0, 1, 5, 1],
-        [1, 2, 2, 2, 2, 2, 2, 2, 2, 0, 0, 0, 0, 1, 2, 2, 0, 0, 0, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 1, 0, 0, 0, 0, 5, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 2, 2, 1, 0, 0, 0, 2, 2, 1, 0, 1],
-        [1, 0, 2, 2, 2, 2, 2, 4, 2, 2, 2, 1, 0, 1, 5, 0, 0, 0, 0, 1, 0, 1],
-        [1, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 1, 2, 2, 0, 0, 0, 1, 0, 1],
-        [1, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 7, 1, 0, 0, 0, 0, 0, 0, 0, 1],
-        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-    ]
-    world_data = place_random_blobs_fair(4, base_world_data)
-    return run_level(screen, clock, level_background, world_data, level_status, next_level=10)
+        profiler.lap("events")
+        accumulator += min(clock.tick(render_fps), MAX_FRAME_MS)
+        profiler.lap("wait")
+        for name, value in world.query_counts().items():
+            profiler.count(name, value)
+        world.reset_query_counts()
+        profiler.end_frame()
+    return end(False)
@@ -1,30 +1,98 @@
+import time
+
+# Taken before anything heavy is imported, so time-to-first-frame
+# includes loading pygame itself.
+START_TIME = time.perf_counter()
+
+import atexit
+import os
 import pygame
 import sys
-from constants import WIDTH, HEIGHT
+from constants import (WIDTH, HEIGHT, WHITE, PROFILE_CSV, THEME_MUSIC, MUSIC_VOLUME,
+                       STARTUP_FRAME_BUDGET_MS, SPLASH_COLOR)
+from display import get_display
 
-# Initialize Pygame and the mixer BEFORE importing screens/levels
-pygame.init()
-pygame.mixer.init()
 
-# Now that the mixer is ready, we can import screens (which loads sounds in levels.py)
-from screens import start_game_screen
+def elapsed_ms():
+    return (time.perf_counter() - START_TIME) * 1000
 
-def main():
-    # Load and play your background music
-    pygame.mixer.music.load("assets/sounds/theme_sound.mp3")
-    pygame.mixer.music.set_volume(0.1)
+
+def show_splash(screen):
+    # Drawn with pygame's built-in font only: no image decoding before the
+    # first frame.
+    screen.fill(SPLASH_COLOR)
+    title = pygame.font.Font(None, 120).render("Ninja Jungle Game", True, WHITE)
+    loading = pygame.font.Font(None, 48).render("Loading...", True, WHITE)
+    screen.blit(title, title.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
+    screen.blit(loading, loading.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
+    get_display().present()
+
+
+def init_audio():
+    # Sound is optional: without an audio device or the music file the
+    # game runs silent instead of failing.
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"[ERROR] Audio disabled: {e}")
+        return
+
+    from audio import get_audio_bank
+    # Decode sound effects up front so nothing is read from disk mid-level.
+    get_audio_bank()
+
+    if not os.path.exists(THEME_MUSIC):
+        print(f"[DEBUG] No background music at {THEME_MUSIC}, skipping")
+        return
+    try:
+        pygame.mixer.music.load(THEME_MUSIC)
+    except pygame.error as e:
+        print(f"[ERROR] Loading music '{THEME_MUSIC}': {e}")
+        return
+    pygame.mixer.music.set_volume(MUSIC_VOLUME)
     pygame.mixer.music.play(-1)
 
-    # Create the main window
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+def main():
+    # Only what the splash needs comes up before the first frame; the
+    # mixer, the sound bank and the game's modules follow behind it.
+    pygame.display.init()
+    pygame.font.init()
+    screen = get_display().open()
     pygame.display.set_caption("Ninja Jungle Game")
+    show_splash(screen)
+    first_frame_ms = elapsed_ms()
+    print(f"[STARTUP] First frame after {first_frame_ms:.0f} ms")
+    if first_frame_ms > STARTUP_FRAME_BUDGET_MS:
+        print(f"[STARTUP] Over the {STARTUP_FRAME_BUDGET_MS} ms budget")
+
+    pygame.init()
+    init_audio()
+
+    from savegame import get_save_manager
+    saves = get_save_manager()
+    saves.load()
+    # Runs on sys.exit() from anywhere, so a pending save is never lost.
+    atexit.register(saves.close)
+
+    from screens import start_game_screen
+    from profiler import get_profiler
+    from menu_loop import print_idle_stats
+
+    # Levels can exit the process directly, so export from an atexit hook.
+    if PROFILE_CSV:
+        atexit.register(get_profiler().export_csv, PROFILE_CSV)
+    atexit.register(print_idle_stats)
+
     clock = pygame.time.Clock()
+    print(f"[STARTUP] Ready after {elapsed_ms():.0f} ms")
 
     # Go to your start screen
     start_game_screen(screen, clock)
 
     # Cleanup on exit
-    pygame.mixer.music.stop()
+    if pygame.mixer.get_init():
+        pygame.mixer.music.stop()
     pygame.quit()
     sys.exit()
 
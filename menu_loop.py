@@ -0,0 +1,106 @@
+import time
+import pygame
+from display import get_display
+from profiler import get_profiler
+from constants import MENU_IDLE_RENDERING, MENU_FPS, MENU_IDLE_TIMEOUT_MS, PROFILER_OVERLAY_REFRESH_MS
+
+# Events that change nothing a menu draws: they are handled but don't
+# cause a redraw.
+PASSIVE_EVENTS = (pygame.MOUSEMOTION,)
+
+# Process-wide idle counters across all menu loops, see idle_stats().
+_totals = {"idle_ms": 0.0, "busy_ms": 0.0, "redraws": 0, "wakeups": 0}
+
+
+class MenuLoop:
+    # Runs one menu screen's frames. In idle mode events() blocks until
+    # input arrives (or the profiler overlay needs a refresh), and a frame
+    # is only drawn when `redraw` is set; a menu left alone sleeps instead
+    # of redrawing 60 times a second. Otherwise every frame is drawn, as
+    # before, capped at `fps`.
+    #
+    #     loop = MenuLoop("store", clock)
+    #     while True:
+    #         for event in loop.events():
+    #             ...
+    #         if loop.redraw:
+    #             ...draw...
+    #             loop.present(screen)
+    def __init__(self, scene, clock, fps=MENU_FPS, idle=MENU_IDLE_RENDERING):
+        self.scene = scene
+        self.clock = clock
+        self.fps = fps
+        self.idle = idle
+        self.redraw = True
+        self._idle_ms = 0.0
+        self._awake = None
+
+    def _sleep(self, wait, *args):
+        now = time.perf_counter()
+        if self._awake is not None:
+            _totals["busy_ms"] += (now - self._awake) * 1000
+        result = wait(*args)
+        self._awake = time.perf_counter()
+        elapsed = (self._awake - now) * 1000
+        self._idle_ms += elapsed
+        _totals["idle_ms"] += elapsed
+        return result
+
+    def events(self):
+        profiler = get_profiler()
+        if not self.idle:
+            self.redraw = True
+            events = pygame.event.get()
+        elif self.redraw:
+            events = pygame.event.get()
+        else:
+            timeout = MENU_IDLE_TIMEOUT_MS
+            if profiler.overlay_visible:
+                timeout = PROFILER_OVERLAY_REFRESH_MS
+            event = self._sleep(pygame.event.wait, timeout)
+            if event.type == pygame.NOEVENT:
+                # Timed out: only the overlay can have changed.
+                events = []
+                self.redraw = profiler.overlay_visible
+            else:
+                events = [event] + pygame.event.get()
+            if any(event.type not in PASSIVE_EVENTS for event in events):
+                self.redraw = True
+            if not self.redraw:
+                _totals["wakeups"] += 1
+        profiler.begin_frame(self.scene)
+        for event in events:
+            profiler.handle_event(event)
+        return events
+
+    def invalidate(self):
+        # Call after another screen or a level ran on top of this one: the
+        # menu is redrawn and the time away isn't counted as its own.
+        self.redraw = True
+        self._awake = None
+
+    def present(self, screen):
+        profiler = get_profiler()
+        profiler.lap("draw")
+        profiler.draw_overlay(screen)
+        get_display().present()
+        profiler.lap("flip")
+        self._sleep(self.clock.tick, self.fps)
+        profiler.lap("wait")
+        profiler.count("idle ms", int(self._idle_ms))
+        profiler.end_frame()
+        self._idle_ms = 0.0
+        self.redraw = False
+        _totals["redraws"] += 1
+
+
+def idle_stats():
+    total = _totals["idle_ms"] + _totals["busy_ms"]
+    return dict(_totals, idle_ratio=_totals["idle_ms"] / total if total else 0.0)
+
+
+def print_idle_stats():
+    stats = idle_stats()
+    print(f"[DEBUG] Menus: {stats['idle_ratio']:.0%} idle ({stats['idle_ms'] / 1000:.1f} s asleep, "
+          f"{stats['busy_ms'] / 1000:.1f} s awake), {stats['redraws']} redraws, "
+          f"{stats['wakeups']} wakeups without one")
@@ -1,71 +1,132 @@
-import sys
 import pygame
 import os
+import json
+from assets import load_image
+from constants import (IMAGES_DIR, SPRITE_SIZE, NINJA_ANIMATIONS, FRAMES_PER_ANIMATION,
+                       ATLAS_IMAGE, ATLAS_META, ANIMATION_FRAME_MS, SIM_TICK_MS,
+                       PLAYER_BLOCKING_TILES, LAVA_TILES)
+
+_atlas_meta = {}
+
+
+def interpolate(prev_pos, pos, alpha):
+    # Draw position between the last two simulation ticks.
+    return (round(prev_pos[0] + (pos[0] - prev_pos[0]) * alpha),
+            round(prev_pos[1] + (pos[1] - prev_pos[1]) * alpha))
+
+
+def load_atlas_animations(skin):
+    # Slices a skin's pre-built sprite sheet (see build_atlas.py) into
+    # subsurfaces. Returns None when no atlas has been built for the skin.
+    meta = _atlas_meta.get(skin)
+    if meta is None:
+        meta_path = os.path.join(IMAGES_DIR, skin, ATLAS_META)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        _atlas_meta[skin] = meta
+    if tuple(meta["frame_size"]) != SPRITE_SIZE:
+        print(f"[ERROR] Atlas for '{skin}' is {meta['frame_size']}, expected {SPRITE_SIZE}; rebuild it.")
+        return None
+    atlas = load_image(os.path.join(skin, ATLAS_IMAGE), alpha=True)
+    return {name: [atlas.subsurface(pygame.Rect(frame)) for frame in frames]
+            for name, frames in meta["animations"].items()}
+
+
+def load_frame_animation(path, prefix):
+    images = []
+    for num in range(FRAMES_PER_ANIMATION):
+        img_path = os.path.join(path, f"{prefix}{str(num).zfill(3)}.png")
+        try:
+            img = load_image(img_path, SPRITE_SIZE)
+        except Exception as e:
+            print(f"[ERROR] Loading image '{img_path}': {e}")
+            continue
+        images.append(img)
+    return images
+
+
+class AnimationSet:
+    # Right- and left-facing frame tables for one skin, built once and
+    # shared by every Ninja wearing that skin.
+    def __init__(self, frames):
+        self.right = frames
+        self.left = {name: [pygame.transform.flip(img, True, False) for img in images]
+                     for name, images in frames.items()}
+
+    def frame_count(self, name):
+        return len(self.right[name])
+
+    def frame(self, name, index, direction):
+        # None for an animation with no frames (all of its files were
+        # missing when the atlas was built).
+        frames = (self.left if direction == -1 else self.right)[name]
+        return frames[index % len(frames)] if frames else None
+
+
+_animation_sets = {}
+
+
+def get_animation_set(skin):
+    animation_set = _animation_sets.get(skin)
+    if animation_set is None:
+        frames = load_atlas_animations(skin)
+        if frames is None:
+            print(f"[DEBUG] No atlas for skin '{skin}', loading individual frames")
+            ninja_path = os.path.join(skin, 'png')
+            frames = {name: load_frame_animation(ninja_path, prefix)
+                      for name, prefix in NINJA_ANIMATIONS.items()}
+        animation_set = AnimationSet(frames)
+        _animation_sets[skin] = animation_set
+    return animation_set
+
 
 class Ninja:
-    def __init__(self, x, y, skin="ninja"):
+    def __init__(self, x, y, skin="ninja", headless=False):
         self.skin = skin
+        self.headless = headless
         print(f"[DEBUG] Creating Ninja with skin: {self.skin}")
         self.reset(x, y)
 
     def reset(self, x, y):
-
-        ninja_path = os.path.join('assets', 'images', self.skin, 'png')
-        self.sprite_width = 40
-        self.sprite_height = 50
-
-
-        self.animations = {
-            "run": self.load_animation(ninja_path, "Run__"),
-            "idle": self.load_animation(ninja_path, "Idle__"),
-            "jump": self.load_animation(ninja_path, "Jump__"),
-            "attack": self.load_animation(ninja_path, "Attack__")
-        }
-
+        self.sprite_width, self.sprite_height = SPRITE_SIZE
+        self.animation_set = None if self.headless else get_animation_set(self.skin)
 
         self.current_animation = "idle"
         self.index = 0
-        self.counter = 0
-        self.image = self.animations[self.current_animation][self.index]
-        self.rect = self.image.get_rect()
+        self.anim_time = 0
+        self.image = None
+        if self.animation_set is not None:
+            self.image = self.animation_set.frame(self.current_animation, self.index, 1)
+        self.rect = pygame.Rect(0, 0, self.sprite_width, self.sprite_height)
         self.rect.width = 30
         self.rect.height = 45
         self.rect.center = (x, y)
         self.rect.x = x
         self.rect.y = y
+        self.prev_pos = self.rect.topleft
         self.vel_y = 0
         self.jumped = False
         self.in_air = True
         self.direction = 1
 
-    def load_animation(self, path, prefix):
-        images = []
-        for num in range(10):
-            img_path = os.path.join(path, f"{prefix}{str(num).zfill(3)}.png")
-            try:
-                img = pygame.image.load(img_path)
-            except Exception as e:
-                print(f"[ERROR] Loading image '{img_path}': {e}")
-                continue
-            img = pygame.transform.scale(img, (self.sprite_width, self.sprite_height))
-            images.append(img)
-        return images
-
-    def update(self, keys, tile_list, lava_tiles, blob_tiles, door_rect):
+    def update(self, keys, tile_grid, blobs, dt_ms=SIM_TICK_MS):
+        self.prev_pos = self.rect.topleft
         dx = 0
         dy = 0
-        walk_cooldown = 5
+        moving = False
 
         self.current_animation = "idle"
 
         if keys[pygame.K_LEFT]:
             dx = -5
-            self.counter += 1
+            moving = True
             self.direction = -1
             self.current_animation = "run"
         if keys[pygame.K_RIGHT]:
             dx = 5
-            self.counter += 1
+            moving = True
             self.direction = 1
             self.current_animation = "run"
         if keys[pygame.K_SPACE] and not self.jumped and not self.in_air:
@@ -80,20 +141,23 @@ class Ninja:
             self.vel_y = 10
         dy += self.vel_y
 
-        if self.counter > walk_cooldown:
-            self.counter = 0
-            self.index += 1
-            if self.index >= len(self.animations[self.current_animation]):
-                self.index = 0
-
-        self.image = self.animations[self.current_animation][self.index]
-        if self.direction == -1:
-            self.image = pygame.transform.flip(self.image, True, False)
+        # Frames only advance while walking, at a fixed rate in wall-clock time.
+        if moving:
+            self.anim_time += dt_ms
+            while self.anim_time >= ANIMATION_FRAME_MS:
+                self.anim_time -= ANIMATION_FRAME_MS
+                self.index += 1
+        if self.animation_set is not None:
+            count = self.animation_set.frame_count(self.current_animation)
+            if count:
+                self.index %= count
+                self.image = self.animation_set.frame(self.current_animation, self.index, self.direction)
 
         self.in_air = True
-        for tile in tile_list:
-            if tile.colliderect(door_rect):
-                continue
+        # Only the cells around the player and both candidate moves are
+        # checked; the door tile is not in PLAYER_BLOCKING_TILES.
+        reach = self.rect.inflate(2 * abs(dx), 2 * abs(dy))
+        for tile in tile_grid.query(reach, PLAYER_BLOCKING_TILES):
             if tile.colliderect(self.rect.x + dx, self.rect.y, self.rect.width, self.rect.height):
                 dx = 0
             if tile.colliderect(self.rect.x, self.rect.y + dy, self.rect.width, self.rect.height):
@@ -105,29 +169,35 @@ class Ninja:
                     self.vel_y = 0
                     self.in_air = False
 
-        for lava_rect in lava_tiles:
+        # Lava kills when the feet are at its surface (5px above it down to
+        # its bottom) with the centre over it; only tiles under the feet
+        # can qualify.
+        feet = pygame.Rect(self.rect.centerx, self.rect.bottom - tile_grid.cell_size, 1, tile_grid.cell_size + 6)
+        for lava_rect in tile_grid.query(feet, LAVA_TILES):
             if (self.rect.bottom >= lava_rect.top - 5 and
                 self.rect.bottom <= lava_rect.bottom and
                 self.rect.centerx > lava_rect.left and
                 self.rect.centerx < lava_rect.right):
                 print("Game Over! Player touched lava.")
-                pygame.quit()
-                sys.exit()
+                return "lava"
 
-        for blob_rect in blob_tiles:
-            smaller_blob_rect = blob_rect.inflate(-10, -10)
-            if self.rect.colliderect(smaller_blob_rect):
-                print("Game Over! Player touched a blob.")
-                pygame.quit()
-                sys.exit()
+        if blobs.touches(self.rect):
+            print("Game Over! Player touched a blob.")
+            return "blob"
 
         self.rect.x += dx
         self.rect.y += dy
 
-        return False
+        return None
+
+    def draw_rect(self, alpha=1.0):
+        return pygame.Rect(interpolate(self.prev_pos, self.rect.topleft, alpha), self.rect.size)
 
-    def draw(self, screen):
-        screen.blit(self.image, self.rect)
+    def draw(self, screen, alpha=1.0, view=(0, 0)):
+        if self.image is None:
+            return
+        x, y = interpolate(self.prev_pos, self.rect.topleft, alpha)
+        screen.blit(self.image, (x - view[0], y - view[1]))
 
     def change_skin(self, new_skin):
         print(f"[DEBUG] Changing skin to: {new_skin}")
@@ -0,0 +1,90 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from assets import is_image_cached, decode_image, cache_decoded_image
+from constants import ATLAS_IMAGE
+from level_pack import get_registry
+from levels import level_images, prepare_world_data, new_seed
+import game_data
+
+
+class PreparedLevel:
+    __slots__ = ("level", "world_data", "seed", "decoded")
+
+    def __init__(self, level, world_data, seed, decoded):
+        self.level = level
+        self.world_data = world_data
+        self.seed = seed
+        self.decoded = decoded
+
+
+class LevelPrefetcher:
+    # Loads a level's data, decodes and scales its images and places its
+    # blobs on a worker thread. take() hands the result over on the main
+    # thread, where the images are converted and put in the image cache.
+    # Only the most recently requested level is kept.
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._level_id = None
+        self._future = None
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, level_id, skin=None):
+        skin = skin or game_data.selected_skin
+        with self._lock:
+            if level_id == self._level_id and self._future is not None:
+                return
+            if self._future is not None:
+                self._future.cancel()
+            self._level_id = level_id
+            self._future = self._executor.submit(self._prepare, level_id, skin)
+
+    def _prepare(self, level_id, skin):
+        level = get_registry().get(level_id)
+        wanted = level_images(level) + [(os.path.join(skin, ATLAS_IMAGE), None)]
+        decoded = [(filename, size, decode_image(filename, size))
+                   for filename, size in wanted if not is_image_cached(filename, size)]
+        seed = new_seed()
+        return PreparedLevel(level, prepare_world_data(level, seed), seed, decoded)
+
+    def take(self, level_id):
+        # Waits for a prefetch of this level if one is still running;
+        # returns None when nothing was prefetched for it.
+        with self._lock:
+            if level_id != self._level_id or self._future is None:
+                self.misses += 1
+                return None
+            future = self._future
+            self._level_id = None
+            self._future = None
+        try:
+            prepared = future.result()
+        except Exception as e:
+            print(f"[ERROR] Prefetching level {level_id}: {e}")
+            self.misses += 1
+            return None
+        for filename, size, image in prepared.decoded:
+            cache_decoded_image(filename, image, size)
+        prepared.decoded = []
+        self.hits += 1
+        return prepared
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_prefetcher = None
+
+
+def get_prefetcher():
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = LevelPrefetcher()
+    return _prefetcher
+
+
+def latest_unlocked(level_status):
+    unlocked = [level for level, status in level_status.items() if status == "unlocked"]
+    return max(unlocked) if unlocked else None
@@ -0,0 +1,172 @@
+import csv
+import time
+from collections import deque
+import pygame
+from assets import get_font, render_text_surface
+from constants import PROFILER_HISTORY, PROFILER_OVERLAY_REFRESH_MS, SIM_TICK_MS
+
+OVERLAY_KEY = pygame.K_F3
+OVERLAY_BG = (0, 0, 0, 170)
+OVERLAY_TEXT = (255, 255, 255)
+GRAPH_OK = (80, 220, 120)
+GRAPH_SLOW = (230, 80, 60)
+GRAPH_WIDTH = 240
+GRAPH_HEIGHT = 60
+
+
+class FrameProfiler:
+    # Splits each frame into named phases with lap(): every lap charges
+    # the time since the previous lap to its phase. Finished frames go
+    # into a ring buffer of PROFILER_HISTORY frames, tagged with the scene
+    # (a level, a menu) they belong to.
+    def __init__(self, history=PROFILER_HISTORY):
+        self.frames = deque(maxlen=history)
+        self.phases = []
+        self.counters = []
+        self.overlay_visible = False
+        self._current = None
+        self._counts = {}
+        self._scene = None
+        self._frame_start = 0.0
+        self._last = 0.0
+        self._outer = []
+        self._panel = None
+        self._panel_time = 0.0
+
+    def begin_frame(self, scene):
+        # A loop started inside another loop's frame (a level run from a
+        # menu) doesn't take that frame over: it is set aside and resumed,
+        # minus the time in between, when the inner frame ends.
+        if self._current is not None:
+            self._outer.append((self._current, self._counts, self._scene, self._frame_start, self._last,
+                                time.perf_counter()))
+        self._frame_start = self._last = time.perf_counter()
+        self._current = {}
+        self._counts = {}
+        self._scene = scene
+
+    def lap(self, name):
+        if self._current is None:
+            return
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def elapsed_ms(self):
+        # Time since begin_frame(), for reacting to this frame's cost.
+        return (time.perf_counter() - self._frame_start) * 1000
+
+    def count(self, name, value):
+        # Adds to a per-frame counter (say, collision queries) that is shown
+        # and exported next to the phase times.
+        if self._current is None:
+            return
+        if name not in self.counters:
+            self.counters.append(name)
+        self._counts[name] = self._counts.get(name, 0) + value
+
+    def end_frame(self):
+        if self._current is None:
+            return
+        for name in self._current:
+            if name not in self.phases:
+                self.phases.append(name)
+        self._current.update(self._counts)
+        self._current["frame"] = (time.perf_counter() - self._frame_start) * 1000
+        self._current["scene"] = self._scene
+        self.frames.append(self._current)
+        self._current = None
+        self._resume_outer()
+
+    def discard_frame(self):
+        # Drops the open frame without recording it, for a loop that
+        # returns mid-frame.
+        if self._current is None:
+            return
+        self._current = None
+        self._resume_outer()
+
+    def _resume_outer(self):
+        if not self._outer:
+            return
+        self._current, self._counts, self._scene, frame_start, last, paused = self._outer.pop()
+        away = time.perf_counter() - paused
+        self._frame_start = frame_start + away
+        self._last = last + away
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.overlay_visible = not self.overlay_visible
+            self._panel = None
+            return True
+        return False
+
+    def averages(self, scene=None):
+        frames = [frame for frame in self.frames if scene is None or frame["scene"] == scene]
+        if not frames:
+            return {}
+        return {name: sum(frame.get(name, 0.0) for frame in frames) / len(frames)
+                for name in self.phases + ["frame"] + self.counters}
+
+    def _build_panel(self):
+        font = get_font(None, 22)
+        latest = self.frames[-1] if self.frames else {}
+        averages = self.averages(latest.get("scene"))
+        fps = 1000 / averages["frame"] if averages.get("frame") else 0.0
+        lines = [f"{latest.get('scene', '')}  {fps:5.1f} fps   now / avg ms"]
+        for name in self.phases + ["frame"]:
+            if name not in latest:
+                continue
+            lines.append(f"{name:<12}{latest.get(name, 0.0):6.2f} {averages.get(name, 0.0):6.2f}")
+        for name in self.counters:
+            if name in latest:
+                lines.append(f"{name:<20}{latest[name]:5d} {averages.get(name, 0.0):6.1f}")
+        line_height = font.get_linesize()
+        text_height = line_height * len(lines)
+        texts = [render_text_surface(line, font, OVERLAY_TEXT) for line in lines]
+        width = max([GRAPH_WIDTH] + [text.get_width() for text in texts])
+        panel = pygame.Surface((width + 20, text_height + GRAPH_HEIGHT + 30), pygame.SRCALPHA)
+        panel.fill(OVERLAY_BG)
+        for i, text in enumerate(texts):
+            panel.blit(text, (10, 10 + i * line_height))
+
+        # Frame-time graph, newest on the right; the line marks one tick.
+        graph_top = text_height + 20
+        scale = GRAPH_HEIGHT / (SIM_TICK_MS * 2)
+        recent = [frame for frame in self.frames if frame["scene"] == latest.get("scene")][-GRAPH_WIDTH:]
+        for x, frame in enumerate(recent, start=10 + GRAPH_WIDTH - len(recent)):
+            height = min(GRAPH_HEIGHT, int(frame["frame"] * scale))
+            color = GRAPH_OK if frame["frame"] <= SIM_TICK_MS else GRAPH_SLOW
+            pygame.draw.line(panel, color, (x, graph_top + GRAPH_HEIGHT), (x, graph_top + GRAPH_HEIGHT - height))
+        target_y = graph_top + GRAPH_HEIGHT - int(SIM_TICK_MS * scale)
+        pygame.draw.line(panel, OVERLAY_TEXT, (10, target_y), (10 + GRAPH_WIDTH, target_y))
+        return panel
+
+    def draw_overlay(self, screen, pos=(10, 10)):
+        if not self.overlay_visible:
+            return
+        now = time.perf_counter()
+        if self._panel is None or (now - self._panel_time) * 1000 >= PROFILER_OVERLAY_REFRESH_MS:
+            self._panel = self._build_panel()
+            self._panel_time = now
+        screen.blit(self._panel, pos)
+
+    def export_csv(self, path):
+        columns = self.phases + ["frame"]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["scene"] + columns + self.counters)
+            for frame in self.frames:
+                writer.writerow([frame["scene"]] + [f"{frame.get(name, 0.0):.4f}" for name in columns]
+                                + [frame.get(name, 0) for name in self.counters])
+        print(f"[DEBUG] Wrote {len(self.frames)} profiled frames to {path}")
+
+
+_profiler = None
+
+
+def get_profiler():
+    global _profiler
+    if _profiler is None:
+        _profiler = FrameProfiler()
+    return _profiler
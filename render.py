@@ -0,0 +1,74 @@
+import pygame
+from constants import DIRTY_RECT_FULL_REDRAW_RATIO
+from display import get_display
+
+
+class DirtyRectRenderer:
+    # Stands in for the screen surface while a frame is drawn: every blit
+    # and fill is recorded, last frame's rects are restored from a cached
+    # background, and present() pushes only the changed areas to the
+    # display. Falls back to a full flip when too much of the screen moved.
+    def __init__(self, screen, full_redraw_ratio=DIRTY_RECT_FULL_REDRAW_RATIO):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.full_redraw_ratio = full_redraw_ratio
+        self.background = None
+        self.previous = []
+        self.current = []
+        self.force_full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.last_dirty_area = 0
+
+    def invalidate(self):
+        self.force_full = True
+
+    def begin(self, background):
+        if background is not self.background:
+            self.background = background
+            self.force_full = True
+        if self.force_full:
+            self.screen.blit(background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(background, rect, rect)
+
+    def _record(self, rect):
+        rect = rect.clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.current.append(rect)
+        return rect
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        return self._record(self.screen.blit(source, dest, area, special_flags))
+
+    def blits(self, sequence, doreturn=True):
+        rects = [self.blit(*item) for item in sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        return self._record(self.screen.fill(color, rect, special_flags))
+
+    def mark(self, rect):
+        return self._record(pygame.Rect(rect))
+
+    def present(self):
+        dirty = self.previous + self.current
+        self.last_dirty_area = sum(r.width * r.height for r in dirty)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if self.force_full or self.last_dirty_area > screen_area * self.full_redraw_ratio:
+            get_display().present()
+            self.full_frames += 1
+        else:
+            get_display().present(dirty)
+            self.partial_frames += 1
+        self.previous = self.current
+        self.current = []
+        self.force_full = False
+
+    def stats(self):
+        return {
+            "full_frames": self.full_frames,
+            "partial_frames": self.partial_frames,
+            "last_dirty_area": self.last_dirty_area,
+        }
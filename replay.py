@@ -0,0 +1,184 @@
+import argparse
+import os
+import struct
+import sys
+import time
+import collections
+import pygame
+from constants import SKINS, REPLAY_DIR
+
+# Replay file, little-endian:
+#
+#   header   "NJRP", u16 version
+#   info     u16 level id, u32 blob seed, u8 skin (index into SKINS),
+#            u8 outcome (index into OUTCOMES), u16 coins, u32 ticks,
+#            u32 run count
+#   runs     u8 key bits, u16 ticks per run of identical input
+#
+# The simulation only depends on the level, its blob placement (the
+# seed) and the keys held each tick, so replaying the runs reproduces a
+# run tick for tick.
+
+MAGIC = b"NJRP"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+INFO = struct.Struct("<HIBBHII")
+RUN = struct.Struct("<BH")
+MAX_RUN = 0xFFFF
+
+# Keys the player reads, as bits of a run's key state.
+KEY_BITS = ((pygame.K_LEFT, 1), (pygame.K_RIGHT, 2), (pygame.K_SPACE, 4))
+OUTCOMES = (None, "door", "lava", "blob")
+
+
+def key_bits(keys):
+    bits = 0
+    for key, bit in KEY_BITS:
+        if keys[key]:
+            bits |= bit
+    return bits
+
+
+def bits_keys(bits):
+    keys = collections.defaultdict(bool)
+    for key, bit in KEY_BITS:
+        keys[key] = bool(bits & bit)
+    return keys
+
+
+class Replay:
+    # One level's input, tick by tick, as runs of identical key states.
+    # While recording, record() is called with each tick's keys and
+    # observe() with its StepResult; `outcome` and `coins` are what the
+    # recorded run ended with, so a replay can check it got the same.
+    def __init__(self, level_id, seed, skin=SKINS[0]):
+        self.level_id = level_id
+        self.seed = seed
+        self.skin = skin
+        self.outcome = None
+        self.coins = 0
+        self.ticks = 0
+        self.runs = []
+
+    def record(self, keys):
+        bits = key_bits(keys)
+        if self.runs and self.runs[-1][0] == bits and self.runs[-1][1] < MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+        self.ticks += 1
+
+    def observe(self, result):
+        self.coins += result.coins
+        if result.died:
+            self.outcome = result.died
+        elif result.reached_door:
+            self.outcome = "door"
+
+    def inputs(self):
+        # One key mapping per tick, like pygame.key.get_pressed().
+        for bits, count in self.runs:
+            keys = bits_keys(bits)
+            for _ in range(count):
+                yield keys
+
+    def encode(self):
+        skin = SKINS.index(self.skin) if self.skin in SKINS else 0
+        return (HEADER.pack(MAGIC, VERSION)
+                + INFO.pack(self.level_id, self.seed, skin, OUTCOMES.index(self.outcome),
+                            min(self.coins, 0xFFFF), self.ticks, len(self.runs))
+                + b"".join(RUN.pack(bits, count) for bits, count in self.runs))
+
+    def save(self, path=None):
+        if path is None:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(REPLAY_DIR, f"level{self.level_id}-{time.strftime('%Y%m%d-%H%M%S')}.njr")
+        with open(path, "wb") as f:
+            f.write(self.encode())
+        print(f"[DEBUG] Recorded {self.ticks} ticks of level {self.level_id} "
+              f"in {len(self.runs)} runs to {path}")
+        return path
+
+
+def decode_replay(data):
+    if len(data) < HEADER.size + INFO.size:
+        raise ValueError("truncated replay")
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} replay")
+    level_id, seed, skin, outcome, coins, ticks, count = INFO.unpack_from(data, HEADER.size)
+    if skin >= len(SKINS) or outcome >= len(OUTCOMES):
+        raise ValueError("bad skin or outcome")
+    replay = Replay(level_id, seed, SKINS[skin])
+    replay.outcome = OUTCOMES[outcome]
+    replay.coins = coins
+    start = HEADER.size + INFO.size
+    if len(data) < start + count * RUN.size:
+        raise ValueError("truncated replay")
+    replay.runs = [list(run) for run in RUN.iter_unpack(data[start:start + count * RUN.size])]
+    replay.ticks = sum(run[1] for run in replay.runs)
+    if replay.ticks != ticks:
+        raise ValueError(f"{replay.ticks} ticks of input, header says {ticks}")
+    return replay
+
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        return decode_replay(f.read())
+
+
+def play_headless(replay):
+    # Replays as fast as possible, without a window or any images.
+    # Returns the engine and the time the simulation took in ms.
+    from engine import HeadlessEngine
+    from level_pack import get_registry
+    from levels import prepare_world_data
+    world_data = prepare_world_data(get_registry().get(replay.level_id), replay.seed)
+    engine = HeadlessEngine(world_data, skin=replay.skin)
+    start = time.perf_counter()
+    engine.run(replay.inputs())
+    return engine, (time.perf_counter() - start) * 1000
+
+
+def play_realtime(replay):
+    # Replays in a window at the game's normal speed; Escape stops it.
+    from levels import initialize_screen, run_level
+    pygame.init()
+    screen = initialize_screen()
+    pygame.display.set_caption(f"Replay: level {replay.level_id}")
+    return run_level(screen, pygame.time.Clock(), replay.level_id, {}, replay=replay)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded level.")
+    parser.add_argument("path", help="replay file")
+    parser.add_argument("--realtime", action="store_true", help="play it in a window at normal speed")
+    parser.add_argument("--repeat", type=int, default=1, help="headless runs, for a steadier timing")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    replay = load_replay(args.path)
+    print(f"Level {replay.level_id}, seed {replay.seed}, {replay.ticks} ticks in {len(replay.runs)} runs, "
+          f"recorded outcome {replay.outcome}, {replay.coins} coins")
+    if args.realtime:
+        play_realtime(replay)
+        return 0
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    times = []
+    for _ in range(args.repeat):
+        engine, elapsed = play_headless(replay)
+        times.append(elapsed)
+    best = min(times)
+    print(f"Replayed {engine.ticks} ticks in {best:.1f} ms "
+          f"({engine.ticks / best * 1000 if best else 0:.0f} ticks/s), "
+          f"outcome {engine.outcome}, {engine.coins} coins")
+    if (engine.outcome, engine.coins) != (replay.outcome, replay.coins):
+        print("[ERROR] Replay diverged from the recording")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import os
+import struct
+import threading
+import time
+from constants import SAVE_FILE, SAVE_COALESCE_MS, SKINS
+import game_data
+
+# Save file, little-endian:
+#
+#   header   "NJSV", u16 version
+#   state    u32 coins collected, u32 all coins collected,
+#            u8 selected skin (index into SKINS), u8 alternative skin bought,
+#            u16 unlocked level count
+#   levels   u16 id per unlocked level (every other level is locked)
+
+MAGIC = b"NJSV"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+STATE = struct.Struct("<IIBBH")
+
+
+def encode_state():
+    unlocked = sorted(level for level, status in game_data.level_status.items() if status == "unlocked")
+    skin = SKINS.index(game_data.selected_skin) if game_data.selected_skin in SKINS else 0
+    return (HEADER.pack(MAGIC, VERSION)
+            + STATE.pack(game_data.coins_collected, game_data.all_coins_collected, skin,
+                         game_data.alternative_skin_bought, len(unlocked))
+            + struct.pack(f"<{len(unlocked)}H", *unlocked))
+
+
+def decode_state(data):
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} save")
+    coins, all_coins, skin, bought, count = STATE.unpack_from(data, HEADER.size)
+    unlocked = struct.unpack_from(f"<{count}H", data, HEADER.size + STATE.size)
+    game_data.coins_collected = coins
+    game_data.all_coins_collected = all_coins
+    game_data.selected_skin = SKINS[skin] if skin < len(SKINS) else SKINS[0]
+    game_data.alternative_skin_bought = bool(bought)
+    game_data.level_status = {level: "unlocked" for level in unlocked}
+
+
+class SaveManager:
+    # Keeps the progress in game_data (coins, skins, level status) in
+    # SAVE_FILE. save() only snapshots the state, which takes microseconds;
+    # a writer thread writes the newest snapshot SAVE_COALESCE_MS later, so
+    # a burst of saves (coin pickups) becomes one write. A write goes to a
+    # temporary file that then replaces the save, so a crash mid-write
+    # leaves the old save intact.
+    #
+    # Nothing is saved until load() has run: code that never loads a save
+    # (benchmarks, the headless engine) never writes one either.
+    def __init__(self, path=SAVE_FILE, coalesce_ms=SAVE_COALESCE_MS):
+        self.path = path
+        self.coalesce_ms = coalesce_ms
+        self.loaded = False
+        self.requests = 0
+        self.writes = 0
+        self._pending = None
+        self._sequence = 0
+        self._written = 0
+        self._closed = False
+        self._thread = None
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+
+    def load(self):
+        # Applies the save to game_data; returns False (and keeps the
+        # defaults) when there is none or it can't be read.
+        self.loaded = True
+        start = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                decode_state(f.read())
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[ERROR] Ignoring save file {self.path}: {e}")
+            return False
+        print(f"[DEBUG] Loaded save in {(time.perf_counter() - start) * 1000:.2f} ms")
+        return True
+
+    def save(self):
+        if not self.loaded:
+            return
+        data = encode_state()
+        with self._cond:
+            self._sequence += 1
+            self._pending = (self._sequence, data)
+            self.requests += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # Let further saves pile up; only the newest gets written.
+                deadline = time.monotonic() + self.coalesce_ms / 1000
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                pending, self._pending = self._pending, None
+            if pending is not None:
+                self._write(*pending)
+
+    def _write(self, sequence, data):
+        with self._write_lock:
+            if sequence <= self._written:
+                return
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"[ERROR] Saving to {self.path}: {e}")
+                return
+            self._written = sequence
+            self.writes += 1
+
+    def flush(self):
+        # Writes a pending save now, on the calling thread.
+        with self._cond:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._write(*pending)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+_save_manager = None
+
+
+def get_save_manager():
+    global _save_manager
+    if _save_manager is None:
+        _save_manager = SaveManager()
+    return _save_manager
@@ -0,0 +1,105 @@
+import pygame
+from display import get_display
+from menu_loop import MenuLoop
+
+
+class Scene:
+    # A menu screen that lives for the whole run. load() runs once, on the
+    # first visit, and is where images are loaded and static parts are
+    # composed; every later visit reuses them. enter() runs each time the
+    # scene is pushed, resume() when the scene above it is popped, and
+    # suspend() when it is covered or popped.
+    name = "scene"
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.loaded = False
+        self.loop = MenuLoop(self.name, manager.clock)
+
+    def load(self, screen):
+        pass
+
+    def enter(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def suspend(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def draw(self, screen):
+        pass
+
+
+class SceneManager:
+    # A stack of long-lived scenes, one object per Scene class. Only the
+    # top scene gets events and is drawn; run() returns once the stack is
+    # empty.
+    def __init__(self, screen, clock):
+        self.screen = screen
+        self.clock = clock
+        self.stack = []
+        self.scenes = {}
+        self.loads = 0
+
+    def scene(self, scene_class):
+        scene = self.scenes.get(scene_class)
+        if scene is None:
+            scene = scene_class(self)
+            self.scenes[scene_class] = scene
+        return scene
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene_class):
+        scene = self.scene(scene_class)
+        if self.stack:
+            self.stack[-1].suspend()
+        if not scene.loaded:
+            scene.load(self.screen)
+            scene.loaded = True
+            self.loads += 1
+            print(f"[DEBUG] Loaded scene {scene.name}")
+        self.stack.append(scene)
+        scene.loop.invalidate()
+        scene.enter()
+        return scene
+
+    def pop(self):
+        self.stack.pop().suspend()
+        if self.stack:
+            self.stack[-1].loop.invalidate()
+            self.stack[-1].resume()
+
+    def quit(self):
+        while self.stack:
+            self.stack.pop().suspend()
+
+    def run(self):
+        while self.stack:
+            scene = self.stack[-1]
+            for event in scene.loop.events():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                    return
+                scene.handle_event(event)
+                if self.top is not scene:
+                    # The scene changed; the rest of this batch was meant
+                    # for the old one.
+                    break
+            if self.top is scene and scene.loop.redraw:
+                scene.draw(self.screen)
+                scene.loop.present(self.screen)
+
+
+def mouse_click(event, left_only=True):
+    # Logical position of a mouse button press, or None for other events.
+    if event.type != pygame.MOUSEBUTTONDOWN or (left_only and event.button != 1):
+        return None
+    return get_display().to_logical(event.pos)